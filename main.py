@@ -1,21 +1,121 @@
 import sys
 import os
+import atexit
+import errno
+import functools
+import threading
 import subprocess
 import shutil
+import shlex
+import tempfile
 import logging
 import hashlib
 import json
+import ssl
 import uuid
+import concurrent.futures
 from datetime import datetime
+from functools import cached_property
 from collections import deque
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QLabel, QVBoxLayout, QHBoxLayout,
                              QMessageBox, QProgressBar, QGraphicsDropShadowEffect, QPushButton,
-                             QFileDialog, QDialog, QTextEdit, QTabWidget, QListWidget, QListWidgetItem,
-                             QSplitter, QGroupBox, QCheckBox, QComboBox, QSpinBox, QTableWidget,
-                             QTableWidgetItem, QHeaderView, QTextBrowser, QStatusBar, QMenuBar, QMenu,
+                             QFileDialog, QTabWidget, QListWidget, QListWidgetItem, QCheckBox,
+                             QTableWidget, QTableWidgetItem, QTextBrowser, QMenu,
                              QAction, QSystemTrayIcon, QStyle, QFormLayout, QLineEdit)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QSettings, QUrl
-from PyQt5.QtGui import QDragEnterEvent, QDropEvent, QFont, QIcon, QPixmap, QDesktopServices
+from PyQt5.QtCore import (Qt, QThread, pyqtSignal, QTimer, QSettings, QObject, QRunnable,
+                          QThreadPool, QMutex, QWaitCondition, QProcess)
+from PyQt5.QtGui import QDragEnterEvent, QDropEvent, QFont
+
+try:
+    import libarchive  # Optional: python-libarchive-c, extracts archives in-process
+except ImportError:
+    libarchive = None
+
+# Application-wide stylesheet, parsed once by QApplication; widgets opt in by objectName
+STYLESHEET = """
+QWidget#dropZone {
+    background-color: #ecf0f1;
+    border: 2px dashed #bdc3c7;
+    border-radius: 15px;
+    padding: 20px;
+}
+QWidget#dropZone[dragActive="true"] {
+    background-color: #d5f4e6;
+    border: 2px dashed #27ae60;
+}
+
+QPushButton#browseButton, QPushButton#installButton,
+QPushButton#addToQueueButton, QPushButton#removeFromQueueButton, QPushButton#clearQueueButton,
+QPushButton#refreshHistoryButton, QPushButton#clearHistoryButton,
+QPushButton#batchInstallButton, QPushButton#saveSettingsButton {
+    color: white;
+    border: none;
+    border-radius: 8px;
+    padding: 8px 16px;
+    font-weight: 500;
+}
+QPushButton#browseButton, QPushButton#installButton {
+    padding: 10px 20px;
+}
+QPushButton#batchInstallButton, QPushButton#saveSettingsButton {
+    border-radius: 10px;
+    padding: 12px 24px;
+    font-weight: 600;
+}
+
+QPushButton#browseButton, QPushButton#addToQueueButton, QPushButton#refreshHistoryButton { background-color: #3498db; }
+QPushButton#browseButton:hover, QPushButton#addToQueueButton:hover, QPushButton#refreshHistoryButton:hover { background-color: #2980b9; }
+QPushButton#browseButton:pressed, QPushButton#addToQueueButton:pressed, QPushButton#refreshHistoryButton:pressed { background-color: #21618c; }
+
+QPushButton#installButton, QPushButton#batchInstallButton, QPushButton#saveSettingsButton { background-color: #27ae60; }
+QPushButton#installButton:hover, QPushButton#batchInstallButton:hover, QPushButton#saveSettingsButton:hover { background-color: #229954; }
+QPushButton#installButton:pressed, QPushButton#batchInstallButton:pressed, QPushButton#saveSettingsButton:pressed { background-color: #1e8449; }
+
+QPushButton#removeFromQueueButton, QPushButton#clearHistoryButton { background-color: #e74c3c; }
+QPushButton#removeFromQueueButton:hover, QPushButton#clearHistoryButton:hover { background-color: #c0392b; }
+QPushButton#removeFromQueueButton:pressed, QPushButton#clearHistoryButton:pressed { background-color: #a93226; }
+
+QPushButton#clearQueueButton { background-color: #f39c12; }
+QPushButton#clearQueueButton:hover { background-color: #e67e22; }
+QPushButton#clearQueueButton:pressed { background-color: #d35400; }
+
+QListWidget#queueList {
+    border: 1px solid #bdc3c7;
+    border-radius: 8px;
+    padding: 5px;
+    background-color: white;
+}
+QListWidget#queueList::item {
+    padding: 8px;
+    border-bottom: 1px solid #ecf0f1;
+}
+QListWidget#queueList::item:selected {
+    background-color: #3498db;
+    color: white;
+}
+
+QTableWidget#historyTable {
+    border: 1px solid #bdc3c7;
+    border-radius: 8px;
+    background-color: white;
+    gridline-color: #ecf0f1;
+}
+QTableWidget#historyTable QHeaderView::section {
+    background-color: #34495e;
+    color: white;
+    padding: 8px;
+    border: none;
+    font-weight: 600;
+}
+QTableWidget#historyTable::item {
+    padding: 8px;
+    border-bottom: 1px solid #ecf0f1;
+}
+QTableWidget#historyTable::item:selected {
+    background-color: #3498db;
+    color: white;
+}
+"""
 
 def global_exception_handler(exctype, value, traceback):
     """Global exception handler to catch unhandled exceptions"""
@@ -29,219 +129,442 @@ def global_exception_handler(exctype, value, traceback):
 
 sys.excepthook = global_exception_handler
 
-class InstallationTask:
-    """Represents a single installation task"""
-    def __init__(self, file_path, task_id=None):
-        self.file_path = file_path
-        self.task_id = task_id or hashlib.md5(file_path.encode()).hexdigest()[:8]
-        self.status = "queued"  # queued, installing, completed, failed
-        self.progress = 0
-        self.message = ""
-        self.start_time = None
-        self.end_time = None
-        self.file_hash = self.calculate_hash()
-        self.file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
-
-    def calculate_hash(self):
-        """Calculate SHA256 hash of the file"""
+@functools.lru_cache(maxsize=None)
+def _font(size, weight=QFont.Normal):
+    """Shared UI font; setFont() copies it, so one instance serves every widget"""
+    return QFont("Helvetica Neue", size, weight)
+
+@functools.lru_cache(maxsize=None)
+def _which(name):
+    """Cached shutil.which so a batch walks $PATH once per tool"""
+    return shutil.which(name)
+
+_SUPPORTED_EXTS = frozenset({'deb', 'appimage', 'tar.gz', 'tar.xz', 'tgz', 'snap', 'flatpak', 'run', 'bin'})
+_SUPPORTED_LABEL = ", ".join(f".{ext}" for ext in sorted(_SUPPORTED_EXTS))
+_FILE_DIALOG_FILTER = ("All Supported Files (" + " ".join(f"*.{ext}" for ext in sorted(_SUPPORTED_EXTS)) +
+                       ");;All Files (*)")
+
+_DOUBLE_EXTS = ('.tar.gz', '.tar.xz')
+
+@functools.lru_cache(maxsize=4096)
+def _file_ext(path):
+    """Lowercase installer extension of a path, e.g. 'deb' or 'tar.gz'"""
+    low = path.lower()
+    for double_ext in _DOUBLE_EXTS:
+        if low.endswith(double_ext):
+            return double_ext[1:]
+    base, dot, ext = low.rpartition('/')[2].rpartition('.')
+    return ext if dot and base.lstrip('.') else ''
+
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB
+COPY_CHUNK_SIZE = 1 << 20  # Userspace copy fallback; shutil defaults to 64 KiB on Linux
+HISTORY_DISPLAY_LIMIT = 100  # Rows shown in the History tab
+LOG_VIEW_TAIL_BYTES = 256 * 1024  # Only the end of installer.log is shown
+SETTINGS_DEFAULTS = {  # Also fixes each setting's type when read back
+    "auto_start_queue": False,
+    "show_notifications": True,
+    "verbose_logging": False,
+    "durable_history": False,
+    "install_dir": "/opt",
+}
+
+def _fadvise(fd, *advice):
+    """Best-effort posix_fadvise over the whole file"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for value in advice:
         try:
-            with open(self.file_path, 'rb') as f:
-                return hashlib.sha256(f.read()).hexdigest()
-        except:
-            return "unknown"
-
-    def get_file_type(self):
-        """Get the file type/extension"""
-        if self.file_path.endswith('.tar.gz'):
-            return 'tar.gz'
-        elif self.file_path.endswith('.tar.xz'):
-            return 'tar.xz'
-        _, ext = os.path.splitext(self.file_path)
-        return ext.lower().lstrip('.')
-
-    def to_dict(self):
-        """Convert to dictionary for JSON serialization"""
-        return {
-            'file_path': self.file_path,
-            'task_id': self.task_id,
-            'status': self.status,
-            'progress': self.progress,
-            'message': self.message,
-            'start_time': self.start_time.isoformat() if self.start_time else None,
-            'end_time': self.end_time.isoformat() if self.end_time else None,
-            'file_hash': self.file_hash,
-            'file_size': self.file_size
-        }
-
-    @classmethod
-    def from_dict(cls, data):
-        """Create instance from dictionary"""
-        task = cls(data['file_path'], data.get('task_id'))
-        task.status = data.get('status', 'queued')
-        task.progress = data.get('progress', 0)
-        task.message = data.get('message', '')
-        task.start_time = datetime.fromisoformat(data['start_time']) if data.get('start_time') else None
-        task.end_time = datetime.fromisoformat(data['end_time']) if data.get('end_time') else None
-        task.file_hash = data.get('file_hash', 'unknown')
-        task.file_size = data.get('file_size', 0)
-        return task
-
-class BatchInstaller(QThread):
-    """Handles batch installation of multiple files"""
-    progress_updated = pyqtSignal(str, int, str)  # task_id, progress, message
-    task_completed = pyqtSignal(str, bool, str)   # task_id, success, message
-    batch_finished = pyqtSignal()
-
-    def __init__(self, tasks):
-        super().__init__()
-        self.tasks = deque(tasks)
-        self.running = True
+            os.posix_fadvise(fd, 0, 0, value)
+        except OSError:
+            pass
+
+def _prefetch_file(path):
+    """Ask the kernel to start reading a file before a subprocess opens it"""
+    if not hasattr(os, 'POSIX_FADV_WILLNEED'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        _fadvise(fd, os.POSIX_FADV_SEQUENTIAL, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+def _sha256_file(path):
+    """Stream a file through SHA256 without loading it into memory"""
+    with open(path, 'rb', buffering=0) as f:
+        if hasattr(os, 'POSIX_FADV_SEQUENTIAL'):
+            _fadvise(f.fileno(), os.POSIX_FADV_SEQUENTIAL, os.POSIX_FADV_WILLNEED)
+        try:
+            if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            digest = hashlib.sha256()
+            buf = memoryview(bytearray(HASH_CHUNK_SIZE))
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                digest.update(buf[:n])
+            return digest.hexdigest()
+        finally:
+            if hasattr(os, 'POSIX_FADV_DONTNEED'):
+                _fadvise(f.fileno(), os.POSIX_FADV_DONTNEED)  # Don't keep one-shot pages cached
+
+def _extract_archive(file_path, extract_dir, on_entry=None):
+    """Extract an archive in-process with libarchive. Returns False if it isn't installed
+    or the extraction fails, so the caller can fall back to tar."""
+    if libarchive is None:
+        return False
+    # Secure-symlink checks cover every component of the absolute path; resolve
+    # symlinked parents such as /home -> var/home up front
+    extract_dir = os.path.realpath(extract_dir)
+    flags = (libarchive.extract.EXTRACT_TIME | libarchive.extract.EXTRACT_PERM |
+             libarchive.extract.EXTRACT_SECURE_NODOTDOT | libarchive.extract.EXTRACT_SECURE_SYMLINKS)
+
+    def entries(archive):
+        for count, entry in enumerate(archive, 1):
+            name = entry.pathname
+            entry.pathname = os.path.join(extract_dir, name.lstrip('/'))
+            if entry.islnk:  # Hard link targets are archive-relative too
+                entry.linkpath = os.path.join(extract_dir, entry.linkpath.lstrip('/'))
+            if on_entry:
+                on_entry(count, name)
+            yield entry
 
-    def run(self):
-        while self.tasks and self.running:
-            task = self.tasks.popleft()
-            task.status = "installing"
-            task.start_time = datetime.now()
+    try:
+        with libarchive.file_reader(file_path) as archive:
+            libarchive.extract.extract_entries(entries(archive), flags)
+    except libarchive.ArchiveError as e:
+        logging.warning(f"libarchive could not extract {file_path}, falling back to tar: {e}")
+        return False
+    return True
+
+def _tar_command(file_path, extract_dir):
+    """tar invocation for an archive, decompressing with pigz/pixz when they are installed"""
+    cmd = ['tar', '-xf', file_path, '-C', extract_dir, '--no-same-owner', '--no-same-permissions']
+    ext = _file_ext(file_path)
+    compressor = 'pigz' if ext in ('tar.gz', 'tgz') else 'pixz' if ext == 'tar.xz' else None
+    if compressor and _which(compressor):
+        cmd[1:1] = ['-I', compressor]  # Parallel decompression; .xz is CPU bound
+    return cmd
+
+def _copy_fd_range(infd, outfd, count):
+    """Copy count bytes between the fds' current offsets in-kernel. Returns the bytes left."""
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while count > 0:
+                copied = os.copy_file_range(infd, outfd, min(count, 1 << 30))
+                if not copied:
+                    break
+                count -= copied
+        except OSError:
+            pass  # e.g. cross-filesystem on kernels before 5.3; try sendfile
+    if count > 0 and hasattr(os, 'sendfile'):
+        try:
+            while count > 0:
+                sent = os.sendfile(outfd, infd, None, min(count, 1 << 30))
+                if not sent:
+                    break
+                count -= sent
+        except OSError:
+            pass
+    return count
+
+def _copy_file(src, dest):
+    """Copy a file's data and metadata, in-kernel where the platform allows"""
+    try:
+        with open(src, 'rb', buffering=0) as fsrc, open(dest, 'wb', buffering=0) as fdst:
+            if _copy_fd_range(fsrc.fileno(), fdst.fileno(), os.fstat(fsrc.fileno()).st_size):
+                shutil.copyfileobj(fsrc, fdst, COPY_CHUNK_SIZE)  # Finish whatever the kernel couldn't copy
+        shutil.copystat(src, dest)
+    except BaseException:
+        try:
+            os.unlink(dest)
+        except OSError:
+            pass
+        raise
 
+def _move_file(src, dest):
+    """Move a file by rename, or by an in-kernel copy when it crosses filesystems"""
+    try:
+        os.replace(src, dest)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    _copy_file(src, dest)
+    os.unlink(src)
+
+def _move_to_free_path(src, directory):
+    """Move src into directory, adding a _N suffix if its name is taken. Returns the new path."""
+    # One directory read instead of a stat per candidate name
+    existing = set(os.listdir(directory))
+    base, ext = os.path.splitext(os.path.basename(src))
+    name, counter = base + ext, 0
+    while True:
+        if name not in existing:
+            dest = os.path.join(directory, name)
             try:
-                self.progress_updated.emit(task.task_id, 10, f"Starting installation of {os.path.basename(task.file_path)}")
-
-                # Determine file type and install
-                ext = self.get_file_type(task.file_path)
-                install_func = getattr(self, f"install_{ext.replace('.', '_')}", None)
-
-                if not install_func:
-                    raise Exception(f"Unsupported file type: {ext}")
-
-                self.progress_updated.emit(task.task_id, 50, "Installing...")
-                result = install_func(task.file_path)
-
-                task.status = "completed"
-                task.message = result
-                self.progress_updated.emit(task.task_id, 100, result)
-                self.task_completed.emit(task.task_id, True, result)
-
-            except Exception as e:
-                task.status = "failed"
-                task.message = str(e)
-                logging.error(f"Installation failed for {task.file_path}: {e}")
-                self.progress_updated.emit(task.task_id, 100, f"Failed: {e}")
-                self.task_completed.emit(task.task_id, False, str(e))
-
-            task.end_time = datetime.now()
-
-        self.batch_finished.emit()
-
-    def get_file_type(self, file_path):
-        if file_path.endswith('.tar.gz'):
-            return 'tar.gz'
-        elif file_path.endswith('.tar.xz'):
-            return 'tar.xz'
-        _, ext = os.path.splitext(file_path)
-        return ext.lower().lstrip('.')
-
-    def install_deb(self, file_path):
-        if not shutil.which('dpkg'):
-            raise Exception("dpkg not found. Please install dpkg.")
-        self.run_command(['pkexec', 'dpkg', '-i', file_path])
-        self.run_command(['pkexec', 'apt-get', 'install', '-f'])
-        return f"Successfully installed {os.path.basename(file_path)}"
-
-    def install_appimage(self, file_path):
-        app_dir = os.path.expanduser("~/Applications")
-        os.makedirs(app_dir, exist_ok=True)
-        dest = os.path.join(app_dir, os.path.basename(file_path))
-        if os.path.exists(dest):
-            base, ext = os.path.splitext(dest)
-            counter = 1
-            while os.path.exists(f"{base}_{counter}{ext}"):
-                counter += 1
-            dest = f"{base}_{counter}{ext}"
-        shutil.move(file_path, dest)
-        os.chmod(dest, 0o755)
-        return f"AppImage installed to {dest}"
-
-    def install_tar_gz(self, file_path):
-        return self.install_tar(file_path)
-
-    def install_tar_xz(self, file_path):
-        return self.install_tar(file_path)
-
-    def install_tgz(self, file_path):
-        return self.install_tar(file_path)
-
-    def install_tar(self, file_path):
-        app_dir = os.path.expanduser("~/Applications")
-        os.makedirs(app_dir, exist_ok=True)
-        extract_dir = os.path.join(app_dir, os.path.splitext(os.path.basename(file_path))[0])
-        os.makedirs(extract_dir, exist_ok=True)
-        self.run_command(['tar', '-xf', file_path, '-C', extract_dir])
-        install_script = os.path.join(extract_dir, 'install.sh')
-        if os.path.exists(install_script):
-            os.chmod(install_script, 0o755)
-            self.run_command(['pkexec', 'bash', install_script])
-        return f"Extracted to {extract_dir}"
-
-    def install_snap(self, file_path):
-        if not shutil.which('snap'):
-            raise Exception("snap not found. Please install snapd.")
-        self.run_command(['pkexec', 'snap', 'install', file_path, '--dangerous'])
-        return f"Successfully installed {os.path.basename(file_path)}"
-
-    def install_flatpak(self, file_path):
-        if not shutil.which('flatpak'):
-            raise Exception("flatpak not found. Please install flatpak.")
-        self.run_command(['flatpak', 'install', '--user', file_path])
-        return f"Successfully installed {os.path.basename(file_path)}"
+                # Reserve the name so concurrent installs can't pick it during the move
+                os.close(os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+                break
+            except FileExistsError:
+                pass
+        counter += 1
+        name = f"{base}_{counter}{ext}"
+    try:
+        _move_file(src, dest)
+    except BaseException:
+        try:
+            os.unlink(dest)
+        except OSError:
+            pass
+        raise
+    return dest
+
+_INSTALLER_SCRIPTS = frozenset({'install.sh', 'uninstall.sh', 'configure'})
+_LIBRARY_EXTS = ('.so', '.dll', '.dylib')
+
+def _find_executables(top, limit=3):
+    """Return up to limit ELF binaries or scripts under top, shallowest directories first"""
+    found = []
+    pending = deque([top])
+    while pending and len(found) < limit:
+        try:
+            with os.scandir(pending.popleft()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                pending.append(entry.path)
+                continue
+            name = entry.name
+            if name in _INSTALLER_SCRIPTS or name.endswith(_LIBRARY_EXTS):
+                continue
+            try:
+                if not entry.is_file(follow_symlinks=False) or not entry.stat(follow_symlinks=False).st_mode & 0o111:
+                    continue
+                fd = os.open(entry.path, os.O_RDONLY)
+                try:
+                    header = os.pread(fd, 4, 0)
+                finally:
+                    os.close(fd)
+            except OSError:
+                continue
+            if header.startswith((b'\x7fELF', b'#!/')):  # ELF binary or script
+                found.append(entry.path)
+                if len(found) == limit:
+                    break
+    return found
+
+APPLICATIONS_DIR = os.path.expanduser("~/.local/share/applications")
+DEFAULTS_LIST_FILE = os.path.join(APPLICATIONS_DIR, "defaults.list")
+MIME_DIR = os.path.expanduser("~/.local/share/mime")
+MIME_PACKAGES_DIR = os.path.join(MIME_DIR, "packages")
+DESKTOP_DIR = os.path.expanduser("~/Desktop")
+
+# Extensions registered to an installed application, by installed file type
+_FILE_ASSOCIATIONS = {
+    'appimage': ('.appimage',),
+    'tar.gz': ('.tar.gz', '.tgz'),
+    'tar.xz': ('.tar.xz',),
+    'run': ('.run',),
+    'bin': ('.bin',),
+}
+
+_UNINSTALL_TMPL = """[Desktop Entry]
+Version=1.0
+Type=Application
+Name=Uninstall {app_name}
+Comment=Uninstall {app_name}
+Exec={exec_cmd}
+Icon=edit-delete
+Terminal=true
+Categories=Utility;System;
+"""
 
-    def install_run(self, file_path):
-        return self.install_executable(file_path)
+# Mime package XML is written as prologue + per-type body + epilogue in one writev()
+_MIME_PACKAGE_PROLOGUE = (b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                          b'<mime-info xmlns="http://www.freedesktop.org/standards/shared-mime-info">\n')
+_MIME_TYPE_TMPL = """  <mime-type type="{mime_type}">
+    <comment>{app_name} {ext} file</comment>
+    <glob pattern="*{ext}"/>
+  </mime-type>
+"""
+_MIME_PACKAGE_EPILOGUE = b'</mime-info>'
 
-    def install_bin(self, file_path):
-        return self.install_executable(file_path)
+def _write_parts_if_changed(path, parts):
+    """Write byte chunks with one writev() unless the file already holds them. Returns True if written."""
+    try:
+        with open(path, 'rb') as f:
+            current = f.read()
+    except FileNotFoundError:
+        current = None
+    if current is not None and len(current) == sum(map(len, parts)):
+        view, offset = memoryview(current), 0
+        for part in parts:
+            if view[offset:offset + len(part)] != part:
+                break
+            offset += len(part)
+        else:
+            return False
 
-    def install_executable(self, file_path):
-        os.chmod(file_path, 0o755)
-        self.run_command(['pkexec', 'bash', file_path])
-        return f"Executed {os.path.basename(file_path)}"
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        written = os.writev(fd, parts)
+        remaining = b''.join(parts)[written:] if written < sum(map(len, parts)) else b''
+        while remaining:  # Short writes are rare on regular files, but possible
+            remaining = remaining[os.write(fd, remaining):]
+    finally:
+        os.close(fd)
+    return True
+
+def _write_atomic(path, content, mode=0o644):
+    """Write a text file via a temporary sibling and os.replace, so readers never see it half-written"""
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _write_desktop_entry(app_name, content):
+    """Atomically write a menu launcher and hard-link it onto the Desktop"""
+    os.makedirs(APPLICATIONS_DIR, exist_ok=True)
+    desktop_file = os.path.join(APPLICATIONS_DIR, f"{app_name}.desktop")
+    _write_atomic(desktop_file, content, 0o755)
+
+    if not os.path.isdir(DESKTOP_DIR):
+        return
+    desktop_shortcut = os.path.join(DESKTOP_DIR, f"{app_name}.desktop")
+    try:
+        os.unlink(desktop_shortcut)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(desktop_file, desktop_shortcut)
+    except OSError:  # e.g. EXDEV when ~/Desktop is another filesystem
+        _copy_file(desktop_file, desktop_shortcut)
 
-    def run_command(self, cmd):
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-        if result.returncode != 0:
-            raise Exception(result.stderr.strip() or result.stdout.strip())
+CACHE_DIR = os.path.expanduser("~/.cache/linux-app-installer")
+HASH_CACHE_FILE = os.path.join(CACHE_DIR, "hashes.json")
+HASH_CACHE_MAX_ENTRIES = 1000
+POST_INSTALL_MARKER_DIR = os.path.join(CACHE_DIR, "post-install")
 
-# Set the global exception handler
-sys.excepthook = global_exception_handler
+def _load_hash_cache():
+    """Load the persistent {realpath: [size, mtime_ns, sha256]} cache"""
+    try:
+        with open(HASH_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}  # A stray list or scalar would break every lookup
+
+_HASH_CACHE = _load_hash_cache()
+_hash_cache_lock = threading.Lock()
+_hash_cache_dirty = False
+
+def _save_hash_cache():
+    """Flush the hash cache to disk if it changed during this session"""
+    if not _hash_cache_dirty:
+        return
+    try:
+        with _hash_cache_lock:
+            data = json.dumps(_HASH_CACHE)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_file = HASH_CACHE_FILE + '.tmp'
+        with open(tmp_file, 'w') as f:
+            f.write(data)
+        os.replace(tmp_file, HASH_CACHE_FILE)
+    except OSError as e:
+        logging.warning(f"Failed to save hash cache: {e}")
+
+atexit.register(_save_hash_cache)
+
+@functools.lru_cache(maxsize=1024)
+def _hash_for_stat(path, size, mtime_ns):
+    """Return the SHA256 for a (path, size, mtime) triple, hashing only on a cache miss"""
+    global _hash_cache_dirty
+    entry = _HASH_CACHE.get(path)
+    if entry and entry[0] == size and entry[1] == mtime_ns:
+        return entry[2]
+    digest = _sha256_file(path)
+    with _hash_cache_lock:
+        _HASH_CACHE.pop(path, None)
+        _HASH_CACHE[path] = [size, mtime_ns, digest]
+        while len(_HASH_CACHE) > HASH_CACHE_MAX_ENTRIES:  # Drop the oldest entries
+            del _HASH_CACHE[next(iter(_HASH_CACHE))]
+        _hash_cache_dirty = True
+    return digest
+
+def _cached_sha256(path):
+    """SHA256 of a file, reusing earlier results while its size and mtime are unchanged"""
+    real_path = os.path.realpath(path)
+    st = os.stat(real_path)
+    return _hash_for_stat(real_path, st.st_size, st.st_mtime_ns)
 
 class InstallationTask:
     """Represents a single installation task"""
     def __init__(self, file_path, task_id=None):
         self.file_path = file_path
+        self.basename = os.path.basename(file_path)
+        self._file_type = _file_ext(file_path)  # Looked up on every queue/history redraw
         self.task_id = task_id or hashlib.md5(file_path.encode()).hexdigest()[:8]
         self.status = "queued"  # queued, installing, completed, failed
         self.progress = 0
         self.message = ""
         self.start_time = None
         self.end_time = None
-        self.file_hash = self.calculate_hash()
-        self.file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        self._start_iso = None  # ISO strings cached at each transition for to_dict
+        self._end_iso = None
+
+    @cached_property
+    def file_hash(self):
+        """SHA256 of the file, computed on first access"""
+        return self.calculate_hash()
+
+    @cached_property
+    def file_size(self):
+        """Size of the file in bytes, looked up on first access"""
+        try:
+            return os.stat(self.file_path).st_size
+        except OSError:
+            return 0
 
     def calculate_hash(self):
         """Calculate SHA256 hash of the file"""
         try:
-            with open(self.file_path, 'rb') as f:
-                return hashlib.sha256(f.read()).hexdigest()
+            return _cached_sha256(self.file_path)
         except:
             return "unknown"
 
+    def resolve_file_info(self):
+        """Look up the size, and the hash if the background job hasn't reported yet,
+        while the file is still in place"""
+        self.file_size  # Cached; history is written after installs may have moved the file
+        if self.file_hash == "pending":
+            self.file_hash = self.calculate_hash()
+
+    def mark_started(self):
+        self.start_time = datetime.now()
+        self._start_iso = self.start_time.isoformat()
+
+    def mark_finished(self):
+        self.end_time = datetime.now()
+        self._end_iso = self.end_time.isoformat()
+
     def get_file_type(self):
         """Get the file type/extension"""
-        if self.file_path.endswith('.tar.gz'):
-            return 'tar.gz'
-        elif self.file_path.endswith('.tar.xz'):
-            return 'tar.xz'
-        _, ext = os.path.splitext(self.file_path)
-        return ext.lower().lstrip('.')
+        return self._file_type
 
     def to_dict(self):
         """Convert to dictionary for JSON serialization"""
@@ -251,8 +574,8 @@ class InstallationTask:
             'status': self.status,
             'progress': self.progress,
             'message': self.message,
-            'start_time': self.start_time.isoformat() if self.start_time else None,
-            'end_time': self.end_time.isoformat() if self.end_time else None,
+            'start_time': self._start_iso or (self.start_time.isoformat() if self.start_time else None),
+            'end_time': self._end_iso or (self.end_time.isoformat() if self.end_time else None),
             'file_hash': self.file_hash,
             'file_size': self.file_size
         }
@@ -266,6 +589,9 @@ class InstallationTask:
         task.message = data.get('message', '')
         task.start_time = datetime.fromisoformat(data['start_time']) if data.get('start_time') else None
         task.end_time = datetime.fromisoformat(data['end_time']) if data.get('end_time') else None
+        task._start_iso = data.get('start_time')
+        task._end_iso = data.get('end_time')
+        # Seed the lazy properties so reloading history never rehashes
         task.file_hash = data.get('file_hash', 'unknown')
         task.file_size = data.get('file_size', 0)
         return task
@@ -276,123 +602,302 @@ class BatchInstaller(QThread):
     task_completed = pyqtSignal(str, bool, str)   # task_id, success, message
     batch_finished = pyqtSignal()
 
+    # Formats with no system-wide lock; these are installed concurrently
+    _PARALLEL_TYPES = frozenset({'appimage', 'tar.gz', 'tar.xz', 'tgz'})
+    MAX_PARALLEL = 4  # Copies and extractions are I/O bound; more threads only add seeks
+
     def __init__(self, tasks):
         super().__init__()
         self.tasks = deque(tasks)
         self.running = True
+        self._local = threading.local()
+        self._dest_lock = threading.Lock()
+        self._deferred_scripts = None  # (task, install.sh, extract_dir) held back while the pool runs
+
+    @property
+    def current_task(self):
+        """Task being installed on the calling thread"""
+        return getattr(self._local, 'task', None)
+
+    @current_task.setter
+    def current_task(self, task):
+        self._local.task = task
 
     def run(self):
+        parallel = [task for task in self.tasks if task.get_file_type() in self._PARALLEL_TYPES]
+        if parallel:
+            self.tasks = deque(task for task in self.tasks
+                               if task.get_file_type() not in self._PARALLEL_TYPES)
+            self._deferred_scripts = []
+            pool = QThreadPool()
+            pool.setMaxThreadCount(min(self.MAX_PARALLEL, os.cpu_count() or 1))
+            for task in parallel:
+                pool.start(InstallRunnable(self, task))
+            pool.waitForDone()
+
+            # Archives extract concurrently, but their root install.sh steps run one at a time
+            deferred, self._deferred_scripts = self._deferred_scripts, None
+            for task, install_script, extract_dir in deferred:
+                self.current_task = task
+                try:
+                    self.run_install_script(install_script)
+                    self.finish_task(task, True, f"Extracted to {extract_dir}")
+                except Exception as e:
+                    self.finish_task(task, False, str(e))
+                finally:
+                    self.current_task = None
+
+        # dpkg/apt, snapd, flatpak and installer scripts must not run concurrently
         while self.tasks and self.running:
-            task = self.tasks.popleft()
-            task.status = "installing"
-            task.start_time = datetime.now()
+            group = [self.tasks.popleft()]
+            if group[0].get_file_type() == 'deb':
+                # Collapse consecutive .deb files into a single elevated dpkg call
+                while self.tasks and self.tasks[0].get_file_type() == 'deb':
+                    group.append(self.tasks.popleft())
+
+            if len(group) > 1:
+                self.install_deb_group(group)
+            else:
+                self.install_task(group[0])
 
-            try:
-                self.progress_updated.emit(task.task_id, 10, f"Starting installation of {os.path.basename(task.file_path)}")
+        self.batch_finished.emit()
+
+    def install_task(self, task):
+        task.resolve_file_info()  # Installing may move the file away
+        task.status = "installing"
+        task.mark_started()
+        self.current_task = task
 
-                # Determine file type and install
-                ext = self.get_file_type(task.file_path)
-                install_func = getattr(self, f"install_{ext.replace('.', '_')}", None)
+        try:
+            self.progress_updated.emit(task.task_id, 10, f"Starting installation of {task.basename}")
 
-                if not install_func:
-                    raise Exception(f"Unsupported file type: {ext}")
+            # Determine file type and install
+            ext = task.get_file_type()
+            install_func = self._INSTALL_DISPATCH.get(ext)
 
-                self.progress_updated.emit(task.task_id, 50, "Installing...")
-                result = install_func(task.file_path)
+            if not install_func:
+                raise Exception(f"Unsupported file type: {ext}")
 
-                task.status = "completed"
-                task.message = result
-                self.progress_updated.emit(task.task_id, 100, result)
-                self.task_completed.emit(task.task_id, True, result)
+            self.progress_updated.emit(task.task_id, 50, "Installing...")
+            result = install_func(self, task.file_path)
+            if result is not None:  # None: finished later by a deferred install.sh step
+                self.finish_task(task, True, result)
 
+        except Exception as e:
+            self.finish_task(task, False, str(e))
+        finally:
+            self.current_task = None
+
+    def install_deb_group(self, tasks):
+        """Install several .deb files with one dpkg -i and one apt-get install -f"""
+        for task in tasks:
+            task.resolve_file_info()
+            task.status = "installing"
+            task.mark_started()
+            self.progress_updated.emit(task.task_id, 10, f"Starting installation of {task.basename}")
+
+        failed = set()
+        error_msg = ""
+        by_package = {}
+        try:
+            if not _which('dpkg'):
+                raise Exception("dpkg not found. Please install dpkg.")
+            on_line, by_package = self.dpkg_progress_parser(tasks)
+            self.run_command(['pkexec', 'dpkg', '-i'] + [task.file_path for task in tasks], on_line)
+        except Exception as e:
+            error_msg = str(e)
+            failed = self.failed_dpkg_tasks(tasks, error_msg, by_package)
+
+        if len(failed) < len(tasks):
+            try:
+                self.run_command(['pkexec', 'apt-get', 'install', '-f'])
+                _which.cache_clear()  # Dependencies may have added or moved tools
             except Exception as e:
-                task.status = "failed"
-                task.message = str(e)
-                logging.error(f"Installation failed for {task.file_path}: {e}")
-                self.progress_updated.emit(task.task_id, 100, f"Failed: {e}")
-                self.task_completed.emit(task.task_id, False, str(e))
+                error_msg = str(e)
+                failed = set(tasks)
 
-            task.end_time = datetime.now()
+        for task in tasks:
+            if task in failed:
+                self.finish_task(task, False, error_msg)
+            else:
+                self.finish_task(task, True, f"Successfully installed {task.basename}")
+
+    def dpkg_progress_parser(self, tasks):
+        """Return a callback mapping dpkg output lines back to per-task progress,
+        and the package name -> task map it fills in from the 'Unpacking' lines"""
+        by_basename = {task.basename: task for task in tasks}
+        by_package = {}
+        current = [None]
+
+        def on_line(line):
+            if line.startswith('Preparing to unpack '):
+                target = line[len('Preparing to unpack '):].rsplit(' ...', 1)[0]
+                current[0] = by_basename.get(os.path.basename(target))
+                if current[0]:
+                    self.progress_updated.emit(current[0].task_id, 30, line)
+            elif line.startswith('Unpacking ') and current[0]:
+                words = line.split()
+                if len(words) > 1:
+                    by_package[words[1].split(':')[0]] = current[0]
+                self.progress_updated.emit(current[0].task_id, 60, line)
+            elif line.startswith('Setting up '):
+                words = line.split()
+                task = by_package.get(words[2].split(':')[0]) if len(words) > 2 else None
+                if task:
+                    self.progress_updated.emit(task.task_id, 90, line)
+
+        return on_line, by_package
+
+    def failed_dpkg_tasks(self, tasks, error_msg, by_package=None):
+        """Work out which files dpkg reported under 'Errors were encountered'"""
+        _, _, listed = error_msg.partition('Errors were encountered while processing:')
+        names = {line.strip() for line in listed.splitlines() if line.strip()}
+        failed = {task for task in tasks
+                  if task.file_path in names or task.basename in names}
+        # Configure-stage failures list package names rather than .deb files
+        if by_package:
+            failed.update(by_package[name.split(':')[0]] for name in names
+                          if name.split(':')[0] in by_package)
+        return failed or set(tasks)  # Fail the whole group if dpkg's report can't be mapped
+
+    def finish_task(self, task, success, message):
+        task.status = "completed" if success else "failed"
+        task.message = message
+        task.mark_finished()
+        if success:
+            self.progress_updated.emit(task.task_id, 100, message)
+        else:
+            logging.error(f"Installation failed for {task.file_path}: {message}")
+            self.progress_updated.emit(task.task_id, 100, f"Failed: {message}")
+        self.task_completed.emit(task.task_id, success, message)
 
-        self.batch_finished.emit()
+    def report_extracted_entry(self, count, name):
+        if self.current_task is not None:
+            self.progress_updated.emit(self.current_task.task_id, 50, f"Extracting {name}")
 
     def get_file_type(self, file_path):
-        if file_path.endswith('.tar.gz'):
-            return 'tar.gz'
-        elif file_path.endswith('.tar.xz'):
-            return 'tar.xz'
-        _, ext = os.path.splitext(file_path)
-        return ext.lower().lstrip('.')
+        return _file_ext(file_path)
 
     def install_deb(self, file_path):
-        if not shutil.which('dpkg'):
+        if not _which('dpkg'):
             raise Exception("dpkg not found. Please install dpkg.")
         self.run_command(['pkexec', 'dpkg', '-i', file_path])
         self.run_command(['pkexec', 'apt-get', 'install', '-f'])
+        _which.cache_clear()  # Dependencies may have added or moved tools
         return f"Successfully installed {os.path.basename(file_path)}"
 
     def install_appimage(self, file_path):
         app_dir = os.path.expanduser("~/Applications")
         os.makedirs(app_dir, exist_ok=True)
-        dest = os.path.join(app_dir, os.path.basename(file_path))
-        if os.path.exists(dest):
-            base, ext = os.path.splitext(dest)
-            counter = 1
-            while os.path.exists(f"{base}_{counter}{ext}"):
-                counter += 1
-            dest = f"{base}_{counter}{ext}"
-        shutil.move(file_path, dest)
+        dest = _move_to_free_path(file_path, app_dir)  # Reserves the name, safe for parallel installs
         os.chmod(dest, 0o755)
         return f"AppImage installed to {dest}"
 
-    def install_tar_gz(self, file_path):
-        return self.install_tar(file_path)
-
-    def install_tar_xz(self, file_path):
-        return self.install_tar(file_path)
-
-    def install_tgz(self, file_path):
-        return self.install_tar(file_path)
-
     def install_tar(self, file_path):
         app_dir = os.path.expanduser("~/Applications")
         os.makedirs(app_dir, exist_ok=True)
         extract_dir = os.path.join(app_dir, os.path.splitext(os.path.basename(file_path))[0])
         os.makedirs(extract_dir, exist_ok=True)
-        self.run_command(['tar', '-xf', file_path, '-C', extract_dir])
+        if not _extract_archive(file_path, extract_dir, self.report_extracted_entry):
+            _prefetch_file(file_path)
+            self.run_command(_tar_command(file_path, extract_dir))
         install_script = os.path.join(extract_dir, 'install.sh')
         if os.path.exists(install_script):
-            os.chmod(install_script, 0o755)
-            self.run_command(['pkexec', 'bash', install_script])
+            if self._deferred_scripts is not None:
+                with self._dest_lock:
+                    self._deferred_scripts.append((self.current_task, install_script, extract_dir))
+                return None
+            self.run_install_script(install_script)
         return f"Extracted to {extract_dir}"
 
+    def run_install_script(self, install_script):
+        os.chmod(install_script, 0o755)
+        self.run_command(['pkexec', 'bash', install_script])
+
     def install_snap(self, file_path):
-        if not shutil.which('snap'):
+        if not _which('snap'):
             raise Exception("snap not found. Please install snapd.")
         self.run_command(['pkexec', 'snap', 'install', file_path, '--dangerous'])
         return f"Successfully installed {os.path.basename(file_path)}"
 
     def install_flatpak(self, file_path):
-        if not shutil.which('flatpak'):
+        if not _which('flatpak'):
             raise Exception("flatpak not found. Please install flatpak.")
         self.run_command(['flatpak', 'install', '--user', file_path])
         return f"Successfully installed {os.path.basename(file_path)}"
 
-    def install_run(self, file_path):
-        return self.install_executable(file_path)
-
-    def install_bin(self, file_path):
-        return self.install_executable(file_path)
-
     def install_executable(self, file_path):
         os.chmod(file_path, 0o755)
         self.run_command(['pkexec', 'bash', file_path])
         return f"Executed {os.path.basename(file_path)}"
 
-    def run_command(self, cmd):
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-        if result.returncode != 0:
-            raise Exception(result.stderr.strip() or result.stdout.strip())
+    def run_command(self, cmd, on_line=None):
+        """Run a command, streaming its output as progress instead of buffering it"""
+        if on_line is None and self.current_task is not None:
+            task_id = self.current_task.task_id
+            on_line = lambda line: self.progress_updated.emit(task_id, 50, line)
+
+        output_tail = deque(maxlen=200)  # Only the tail is kept for error messages
+        timed_out = threading.Event()
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, errors='replace', bufsize=1)
+
+        def kill():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(300, kill)  # 5 min timeout
+        timer.start()
+        try:
+            for line in process.stdout:
+                line = line.rstrip('\n')
+                output_tail.append(line)
+                if on_line and line:
+                    on_line(line)
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+            process.stdout.close()
+
+        if timed_out.is_set():
+            raise Exception(f"Command timed out: {' '.join(cmd)}")
+        if returncode != 0:
+            raise Exception('\n'.join(output_tail).strip())
+
+BatchInstaller._INSTALL_DISPATCH = {
+    'deb': BatchInstaller.install_deb,
+    'appimage': BatchInstaller.install_appimage,
+    'tar.gz': BatchInstaller.install_tar,
+    'tar.xz': BatchInstaller.install_tar,
+    'tgz': BatchInstaller.install_tar,
+    'snap': BatchInstaller.install_snap,
+    'flatpak': BatchInstaller.install_flatpak,
+    'run': BatchInstaller.install_executable,
+    'bin': BatchInstaller.install_executable,
+}
+
+class InstallRunnable(QRunnable):
+    """Installs one BatchInstaller task on a thread pool"""
+    def __init__(self, installer, task):
+        super().__init__()
+        self.installer = installer
+        self.task = task
+
+    def run(self):
+        self.installer.install_task(self.task)
+
+class HashSignals(QObject):
+    hash_ready = pyqtSignal(str, str)  # task_id, file_hash
+
+class HashRunnable(QRunnable):
+    """Computes a task's file hash on the global thread pool"""
+    def __init__(self, task, signals):
+        super().__init__()
+        self.task = task
+        self.signals = signals
+
+    def run(self):
+        self.signals.hash_ready.emit(self.task.task_id, self.task.calculate_hash())
 
 class InstallWorker(QThread):
     finished = pyqtSignal(str)
@@ -410,19 +915,232 @@ class InstallWorker(QThread):
         except Exception as e:
             self.error.emit(str(e))
 
+class HistoryWriter(QThread):
+    """Appends history records to a JSONL log off the GUI thread"""
+    MAX_ENTRIES = 1000   # Records kept across sessions
+    COMPACT_EVERY = 500  # Extra lines tolerated before the log is rewritten
+
+    def __init__(self, path, legacy_path=None):
+        super().__init__()
+        self.path = path
+        self.legacy_path = legacy_path  # Pre-JSONL history.json, migrated on load
+        self._mutex = QMutex()
+        self._wake = QWaitCondition()
+        self._idle = QWaitCondition()
+        self._pending = []  # Tasks waiting to be appended
+        self._recent = deque(maxlen=self.MAX_ENTRIES)
+        self._rewrite = False
+        self._writing = False
+        self.durable = False  # fsync after every write; off by default, the page cache is enough
+        self._stopping = False
+        self._fp = None
+        self._lines = 0  # Lines currently in the log file
+
+    def load(self):
+        """Return the stored records, oldest first"""
+        self.flush()
+        records = deque(maxlen=self.MAX_ENTRIES)
+        lines = 0
+        migrate = False
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    lines += 1
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue  # e.g. a line cut short by a crash
+        elif self.legacy_path and os.path.exists(self.legacy_path):
+            with open(self.legacy_path, 'r') as f:
+                records.extend(json.load(f))
+            migrate = True
+
+        self._mutex.lock()
+        self._recent = records
+        self._lines = lines
+        if migrate:
+            self._rewrite = True
+            self._wake.wakeOne()
+        self._mutex.unlock()
+        return list(records)
+
+    def submit(self, task):
+        self._mutex.lock()
+        self._pending.append(task)
+        self._wake.wakeOne()
+        self._mutex.unlock()
+
+    def clear(self):
+        self._mutex.lock()
+        self._pending.clear()
+        self._recent.clear()
+        self._rewrite = True
+        self._wake.wakeOne()
+        self._mutex.unlock()
+        self.flush()
+
+    def flush(self):
+        """Block until every submitted record is on disk"""
+        self._mutex.lock()
+        while (self._pending or self._rewrite or self._writing) and self.isRunning():
+            self._idle.wait(self._mutex)
+        self._mutex.unlock()
+
+    def stop(self):
+        self._mutex.lock()
+        self._stopping = True
+        self._wake.wakeOne()
+        self._mutex.unlock()
+        self.wait()
+
+    def run(self):
+        while True:
+            self._mutex.lock()
+            while not self._pending and not self._rewrite and not self._stopping:
+                self._wake.wait(self._mutex)
+            tasks, self._pending = self._pending, []
+            rewrite, self._rewrite = self._rewrite, False
+            self._writing = bool(tasks) or rewrite
+            self._mutex.unlock()
+
+            if not self._writing:  # Stopping with nothing left to write
+                break
+            try:
+                if rewrite:
+                    self.compact()
+                if tasks:
+                    self.append([task.to_dict() for task in tasks])
+            except Exception as e:
+                logging.error(f"Failed to save history: {e}")
+
+            self._mutex.lock()
+            self._writing = False
+            self._idle.wakeAll()
+            self._mutex.unlock()
+
+        if self._fp:
+            self._fp.close()
+        self._mutex.lock()
+        self._idle.wakeAll()
+        self._mutex.unlock()
+
+    def append(self, records):
+        if self._fp is None:
+            self._fp = open(self.path, 'a', buffering=64 * 1024)
+        self._fp.write(''.join(json.dumps(record, default=str) + '\n' for record in records))
+        self._fp.flush()
+        if self.durable:
+            os.fsync(self._fp.fileno())
+        self._mutex.lock()
+        self._recent.extend(records)
+        self._mutex.unlock()
+        self._lines += len(records)
+        if self._lines >= self.MAX_ENTRIES + self.COMPACT_EVERY:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the log with only the records worth keeping"""
+        if self._fp:
+            self._fp.close()
+            self._fp = None
+        self._mutex.lock()
+        data = ''.join(json.dumps(record, default=str) + '\n' for record in self._recent)
+        lines = len(self._recent)
+        self._mutex.unlock()
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(data)
+            if self.durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._lines = lines
+        if self.legacy_path and os.path.exists(self.legacy_path):
+            os.remove(self.legacy_path)
+
+class LazyTab(QWidget):
+    """Tab page that defers its refresh until it is actually shown"""
+    def __init__(self, refresh):
+        super().__init__()
+        self._refresh = refresh
+        self.dirty = False
+
+    def mark_dirty(self):
+        if self.isVisible():
+            self.dirty = False
+            self._refresh()
+        else:
+            self.dirty = True
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.dirty:
+            self.dirty = False
+            self._refresh()
+
 class LinuxAppInstaller(QMainWindow):
     def __init__(self):
         super().__init__()
         self.settings = QSettings("LinuxAppInstaller", "Settings")
         logging.basicConfig(filename='installer.log', level=logging.INFO,
                           format='%(asctime)s - %(levelname)s - %(message)s')
+        logging.info(f"Hashing via {ssl.OPENSSL_VERSION} "
+                     f"(file_digest: {hasattr(hashlib, 'file_digest')}, "
+                     f"algorithms: {', '.join(sorted(hashlib.algorithms_available))})")
 
         self.installation_queue = []
+        self._queue_index = {}  # task_id -> queued task, for completion/hash callbacks
         self.installation_history = []
+        self._recent_history = deque(maxlen=HISTORY_DISPLAY_LIMIT)  # Newest first, as displayed
         self.current_batch_installer = None
         self.current_worker = None
         self.installing = False
 
+        self._installers = {
+            'deb': self.install_deb,
+            'appimage': self.install_appimage,
+            'tar.gz': self.install_tar,
+            'tar.xz': self.install_tar,
+            'tgz': self.install_tar,
+            'snap': self.install_snap,
+            'flatpak': self.install_flatpak,
+            'run': self.install_executable,
+            'bin': self.install_executable,
+        }
+
+        self.hash_signals = HashSignals()
+        self.hash_signals.hash_ready.connect(self.on_hash_ready)
+
+        # Coalesce bursts of setting toggles into single writes
+        self._settings_dirty_timer = QTimer(self)
+        self._settings_dirty_timer.setSingleShot(True)
+        self._settings_dirty_timer.setInterval(500)
+        self._settings_dirty_timer.timeout.connect(self.write_settings)
+        # Read every setting once; later reads and no-op write checks use this
+        self._settings_cache = {key: self.settings.value(key, default, type=type(default))
+                                for key, default in SETTINGS_DEFAULTS.items()}
+
+        # One update-desktop-database run per settled group of installs
+        self._pending_desktop_refresh = False
+        self._desktop_db_timer = QTimer(self)
+        self._desktop_db_timer.setSingleShot(True)
+        self._desktop_db_timer.setInterval(1000)
+        self._desktop_db_timer.timeout.connect(self.flush_desktop_db)
+
+        # Runs the independent post-install steps side by side; created on first install
+        self._setup_executor = None
+
+        # Persistent shell for quick housekeeping tools, spawned on first use
+        self._sh = None
+        self._sh_lock = threading.Lock()
+
+        self.history_writer = HistoryWriter('history.jsonl', legacy_path='history.json')
+        self.history_writer.durable = self.get_setting("durable_history")
+        self.history_writer.start()
+
         self.init_ui()
         self.check_dependencies()
         self.setup_system_tray()
@@ -458,7 +1176,7 @@ class LinuxAppInstaller(QMainWindow):
 
         # Title
         title = QLabel("Linux Universal App Installer")
-        title.setFont(QFont("Helvetica Neue", 20, QFont.Light))
+        title.setFont(_font(20, QFont.Light))
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
 
@@ -468,19 +1186,12 @@ class LinuxAppInstaller(QMainWindow):
         drop_layout = QVBoxLayout(self.drop_widget)
         drop_layout.setContentsMargins(20, 20, 20, 20)
 
-        self.drop_label = QLabel("Drop application files here\n\nor use the Browse button below\n\nSupported: .deb, .appimage, .tar.gz, .tar.xz, .tgz, .snap, .flatpak, .run, .bin")
-        self.drop_label.setFont(QFont("Helvetica Neue", 14, QFont.Light))
+        self.drop_label = QLabel(f"Drop application files here\n\nor use the Browse button below\n\nSupported: {_SUPPORTED_LABEL}")
+        self.drop_label.setFont(_font(14, QFont.Light))
         self.drop_label.setAlignment(Qt.AlignCenter)
         drop_layout.addWidget(self.drop_label)
 
-        self.drop_widget.setStyleSheet("""
-            QWidget {
-                background-color: #ecf0f1;
-                border: 2px dashed #bdc3c7;
-                border-radius: 15px;
-                padding: 20px;
-            }
-        """)
+        self.drop_widget.setObjectName("dropZone")
 
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(15)
@@ -493,36 +1204,14 @@ class LinuxAppInstaller(QMainWindow):
         # Buttons
         button_layout = QHBoxLayout()
         self.browse_button = QPushButton("Browse Files")
-        self.browse_button.setFont(QFont("Helvetica Neue", 12))
-        self.browse_button.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-weight: 500;
-            }
-            QPushButton:hover { background-color: #2980b9; }
-            QPushButton:pressed { background-color: #21618c; }
-        """)
+        self.browse_button.setFont(_font(12))
+        self.browse_button.setObjectName("browseButton")
         self.browse_button.clicked.connect(self.browse_files)
         button_layout.addWidget(self.browse_button)
 
         self.install_button = QPushButton("Install Selected")
-        self.install_button.setFont(QFont("Helvetica Neue", 12))
-        self.install_button.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-weight: 500;
-            }
-            QPushButton:hover { background-color: #229954; }
-            QPushButton:pressed { background-color: #1e8449; }
-        """)
+        self.install_button.setFont(_font(12))
+        self.install_button.setObjectName("installButton")
         self.install_button.clicked.connect(self.start_installation)
         self.install_button.setEnabled(False)
         button_layout.addWidget(self.install_button)
@@ -541,87 +1230,39 @@ class LinuxAppInstaller(QMainWindow):
         self.tabs.addTab(tab, "Install")
 
     def create_queue_tab(self):
-        tab = QWidget()
+        tab = self.queue_tab = LazyTab(self.update_queue_display)
         layout = QVBoxLayout(tab)
 
         # Title
         title = QLabel("Installation Queue")
-        title.setFont(QFont("Helvetica Neue", 18, QFont.Light))
+        title.setFont(_font(18, QFont.Light))
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
 
         # Queue list
         self.queue_list = QListWidget()
-        self.queue_list.setFont(QFont("Helvetica Neue", 12))
-        self.queue_list.setStyleSheet("""
-            QListWidget {
-                border: 1px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 5px;
-                background-color: white;
-            }
-            QListWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #ecf0f1;
-            }
-            QListWidget::item:selected {
-                background-color: #3498db;
-                color: white;
-            }
-        """)
+        self.queue_list.setFont(_font(12))
+        self.queue_list.setObjectName("queueList")
         layout.addWidget(self.queue_list)
 
         # Queue controls
         controls_layout = QHBoxLayout()
 
         self.add_to_queue_button = QPushButton("Add to Queue")
-        self.add_to_queue_button.setFont(QFont("Helvetica Neue", 12))
-        self.add_to_queue_button.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 8px 16px;
-                font-weight: 500;
-            }
-            QPushButton:hover { background-color: #2980b9; }
-            QPushButton:pressed { background-color: #21618c; }
-        """)
+        self.add_to_queue_button.setFont(_font(12))
+        self.add_to_queue_button.setObjectName("addToQueueButton")
         self.add_to_queue_button.clicked.connect(self.add_to_queue)
         controls_layout.addWidget(self.add_to_queue_button)
 
         self.remove_from_queue_button = QPushButton("Remove")
-        self.remove_from_queue_button.setFont(QFont("Helvetica Neue", 12))
-        self.remove_from_queue_button.setStyleSheet("""
-            QPushButton {
-                background-color: #e74c3c;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 8px 16px;
-                font-weight: 500;
-            }
-            QPushButton:hover { background-color: #c0392b; }
-            QPushButton:pressed { background-color: #a93226; }
-        """)
+        self.remove_from_queue_button.setFont(_font(12))
+        self.remove_from_queue_button.setObjectName("removeFromQueueButton")
         self.remove_from_queue_button.clicked.connect(self.remove_from_queue)
         controls_layout.addWidget(self.remove_from_queue_button)
 
         self.clear_queue_button = QPushButton("Clear All")
-        self.clear_queue_button.setFont(QFont("Helvetica Neue", 12))
-        self.clear_queue_button.setStyleSheet("""
-            QPushButton {
-                background-color: #f39c12;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 8px 16px;
-                font-weight: 500;
-            }
-            QPushButton:hover { background-color: #e67e22; }
-            QPushButton:pressed { background-color: #d35400; }
-        """)
+        self.clear_queue_button.setFont(_font(12))
+        self.clear_queue_button.setObjectName("clearQueueButton")
         self.clear_queue_button.clicked.connect(self.clear_queue)
         controls_layout.addWidget(self.clear_queue_button)
 
@@ -629,31 +1270,20 @@ class LinuxAppInstaller(QMainWindow):
 
         # Batch install button
         self.batch_install_button = QPushButton("Install All in Queue")
-        self.batch_install_button.setFont(QFont("Helvetica Neue", 14, QFont.Bold))
-        self.batch_install_button.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                color: white;
-                border: none;
-                border-radius: 10px;
-                padding: 12px 24px;
-                font-weight: 600;
-            }
-            QPushButton:hover { background-color: #229954; }
-            QPushButton:pressed { background-color: #1e8449; }
-        """)
+        self.batch_install_button.setFont(_font(14, QFont.Bold))
+        self.batch_install_button.setObjectName("batchInstallButton")
         self.batch_install_button.clicked.connect(self.start_batch_installation)
         layout.addWidget(self.batch_install_button)
 
         self.tabs.addTab(tab, "Queue")
 
     def create_history_tab(self):
-        tab = QWidget()
+        tab = self.history_tab = LazyTab(self.update_history_display)
         layout = QVBoxLayout(tab)
 
         # Title
         title = QLabel("Installation History")
-        title.setFont(QFont("Helvetica Neue", 18, QFont.Light))
+        title.setFont(_font(18, QFont.Light))
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
 
@@ -661,30 +1291,8 @@ class LinuxAppInstaller(QMainWindow):
         self.history_table = QTableWidget()
         self.history_table.setColumnCount(4)
         self.history_table.setHorizontalHeaderLabels(["File", "Type", "Status", "Timestamp"])
-        self.history_table.setFont(QFont("Helvetica Neue", 11))
-        self.history_table.setStyleSheet("""
-            QTableWidget {
-                border: 1px solid #bdc3c7;
-                border-radius: 8px;
-                background-color: white;
-                gridline-color: #ecf0f1;
-            }
-            QHeaderView::section {
-                background-color: #34495e;
-                color: white;
-                padding: 8px;
-                border: none;
-                font-weight: 600;
-            }
-            QTableWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #ecf0f1;
-            }
-            QTableWidget::item:selected {
-                background-color: #3498db;
-                color: white;
-            }
-        """)
+        self.history_table.setFont(_font(11))
+        self.history_table.setObjectName("historyTable")
         self.history_table.horizontalHeader().setStretchLastSection(True)
         self.history_table.setAlternatingRowColors(True)
         layout.addWidget(self.history_table)
@@ -693,36 +1301,14 @@ class LinuxAppInstaller(QMainWindow):
         controls_layout = QHBoxLayout()
 
         self.refresh_history_button = QPushButton("Refresh")
-        self.refresh_history_button.setFont(QFont("Helvetica Neue", 12))
-        self.refresh_history_button.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 8px 16px;
-                font-weight: 500;
-            }
-            QPushButton:hover { background-color: #2980b9; }
-            QPushButton:pressed { background-color: #21618c; }
-        """)
+        self.refresh_history_button.setFont(_font(12))
+        self.refresh_history_button.setObjectName("refreshHistoryButton")
         self.refresh_history_button.clicked.connect(self.load_history)
         controls_layout.addWidget(self.refresh_history_button)
 
         self.clear_history_button = QPushButton("Clear History")
-        self.clear_history_button.setFont(QFont("Helvetica Neue", 12))
-        self.clear_history_button.setStyleSheet("""
-            QPushButton {
-                background-color: #e74c3c;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 8px 16px;
-                font-weight: 500;
-            }
-            QPushButton:hover { background-color: #c0392b; }
-            QPushButton:pressed { background-color: #a93226; }
-        """)
+        self.clear_history_button.setFont(_font(12))
+        self.clear_history_button.setObjectName("clearHistoryButton")
         self.clear_history_button.clicked.connect(self.clear_history)
         controls_layout.addWidget(self.clear_history_button)
 
@@ -736,7 +1322,7 @@ class LinuxAppInstaller(QMainWindow):
 
         # Title
         title = QLabel("Settings")
-        title.setFont(QFont("Helvetica Neue", 18, QFont.Light))
+        title.setFont(_font(18, QFont.Light))
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
 
@@ -747,41 +1333,45 @@ class LinuxAppInstaller(QMainWindow):
 
         # Auto-start queue
         self.auto_start_queue_checkbox = QCheckBox("Auto-start installation queue")
-        self.auto_start_queue_checkbox.setFont(QFont("Helvetica Neue", 12))
-        auto_start_value = self.settings.value("auto_start_queue", False)
-        self.auto_start_queue_checkbox.setChecked(bool(auto_start_value) if auto_start_value is not None else False)
-        self.auto_start_queue_checkbox.stateChanged.connect(self.save_settings)
+        self.auto_start_queue_checkbox.setFont(_font(12))
+        self.auto_start_queue_checkbox.setChecked(self.get_setting("auto_start_queue"))
+        self.auto_start_queue_checkbox.stateChanged.connect(self._settings_dirty_timer.start)
         form_layout.addRow(self.auto_start_queue_checkbox)
 
         # Show notifications
         self.show_notifications_checkbox = QCheckBox("Show desktop notifications")
-        self.show_notifications_checkbox.setFont(QFont("Helvetica Neue", 12))
-        notifications_value = self.settings.value("show_notifications", True)
-        self.show_notifications_checkbox.setChecked(bool(notifications_value) if notifications_value is not None else True)
-        self.show_notifications_checkbox.stateChanged.connect(self.save_settings)
+        self.show_notifications_checkbox.setFont(_font(12))
+        self.show_notifications_checkbox.setChecked(self.get_setting("show_notifications"))
+        self.show_notifications_checkbox.stateChanged.connect(self._settings_dirty_timer.start)
         form_layout.addRow(self.show_notifications_checkbox)
 
         # Verbose logging
         self.verbose_logging_checkbox = QCheckBox("Enable verbose logging")
-        self.verbose_logging_checkbox.setFont(QFont("Helvetica Neue", 12))
-        logging_value = self.settings.value("verbose_logging", False)
-        self.verbose_logging_checkbox.setChecked(bool(logging_value) if logging_value is not None else False)
-        self.verbose_logging_checkbox.stateChanged.connect(self.save_settings)
+        self.verbose_logging_checkbox.setFont(_font(12))
+        self.verbose_logging_checkbox.setChecked(self.get_setting("verbose_logging"))
+        self.verbose_logging_checkbox.stateChanged.connect(self._settings_dirty_timer.start)
         form_layout.addRow(self.verbose_logging_checkbox)
 
+        # Durable history
+        self.durable_history_checkbox = QCheckBox("Sync history to disk after every installation")
+        self.durable_history_checkbox.setFont(_font(12))
+        self.durable_history_checkbox.setChecked(self.history_writer.durable)
+        self.durable_history_checkbox.stateChanged.connect(self._settings_dirty_timer.start)
+        form_layout.addRow(self.durable_history_checkbox)
+
         # Default installation directory
         self.install_dir_label = QLabel("Default installation directory:")
-        self.install_dir_label.setFont(QFont("Helvetica Neue", 12))
-        self.install_dir_edit = QLineEdit(self.settings.value("install_dir", "/opt"))
-        self.install_dir_edit.setFont(QFont("Helvetica Neue", 12))
-        self.install_dir_edit.textChanged.connect(self.save_settings)
+        self.install_dir_label.setFont(_font(12))
+        self.install_dir_edit = QLineEdit(self.get_setting("install_dir"))
+        self.install_dir_edit.setFont(_font(12))
+        self.install_dir_edit.textChanged.connect(self._settings_dirty_timer.start)
         form_layout.addRow(self.install_dir_label, self.install_dir_edit)
 
         # Browse button for install dir
         browse_layout = QHBoxLayout()
         browse_layout.addWidget(self.install_dir_edit)
         self.browse_install_dir_button = QPushButton("Browse...")
-        self.browse_install_dir_button.setFont(QFont("Helvetica Neue", 10))
+        self.browse_install_dir_button.setFont(_font(10))
         self.browse_install_dir_button.clicked.connect(self.browse_install_dir)
         browse_layout.addWidget(self.browse_install_dir_button)
         form_layout.addRow(browse_layout)
@@ -790,19 +1380,8 @@ class LinuxAppInstaller(QMainWindow):
 
         # Save button
         self.save_settings_button = QPushButton("Save Settings")
-        self.save_settings_button.setFont(QFont("Helvetica Neue", 14, QFont.Bold))
-        self.save_settings_button.setStyleSheet("""
-            QPushButton {
-                background-color: #27ae60;
-                color: white;
-                border: none;
-                border-radius: 10px;
-                padding: 12px 24px;
-                font-weight: 600;
-            }
-            QPushButton:hover { background-color: #229954; }
-            QPushButton:pressed { background-color: #1e8449; }
-        """)
+        self.save_settings_button.setFont(_font(14, QFont.Bold))
+        self.save_settings_button.setObjectName("saveSettingsButton")
         self.save_settings_button.clicked.connect(self.save_settings)
         layout.addWidget(self.save_settings_button)
 
@@ -811,18 +1390,22 @@ class LinuxAppInstaller(QMainWindow):
         self.tabs.addTab(tab, "Settings")
 
     def create_help_tab(self):
-        tab = QWidget()
+        tab = self.help_tab = LazyTab(self.populate_help_tab)
         layout = QVBoxLayout(tab)
 
         # Title
         title = QLabel("Help & Documentation")
-        title.setFont(QFont("Helvetica Neue", 18, QFont.Light))
+        title.setFont(_font(18, QFont.Light))
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
 
+        self.tabs.addTab(tab, "Help")
+        tab.mark_dirty()  # Content is built the first time the tab is shown
+
+    def populate_help_tab(self):
         # Help content
         help_browser = QTextBrowser()
-        help_browser.setFont(QFont("Helvetica Neue", 12))
+        help_browser.setFont(_font(12))
         help_browser.setOpenExternalLinks(True)
         help_content = """
         <h2>Linux Universal App Installer</h2>
@@ -851,10 +1434,13 @@ class LinuxAppInstaller(QMainWindow):
 
         <h3>Settings</h3>
         <p>Configure auto-start queue, notifications, logging, and installation directory in the Settings tab.</p>
+        <p><b>Sync history to disk after every installation</b> makes each history entry survive a power loss
+        or system crash, at the cost of an fsync per installation. When it is off (the default), history is
+        written through the OS page cache and the most recent entries may be lost if the system crashes.</p>
 
         <h3>Troubleshooting</h3>
         <ul>
-        <li>Check the error logs via the Logs menu if installations fail</li>
+        <li>Check the error logs via View &gt; View Logs if installations fail</li>
         <li>Ensure you have the necessary package managers installed (dpkg, snap, flatpak)</li>
         <li>Some installations require administrator privileges</li>
         </ul>
@@ -863,9 +1449,7 @@ class LinuxAppInstaller(QMainWindow):
         <p>Version 2.0 - Enterprise-grade Linux application installer with professional UI and robust error handling.</p>
         """
         help_browser.setHtml(help_content)
-        layout.addWidget(help_browser)
-
-        self.tabs.addTab(tab, "Help")
+        self.help_tab.layout().addWidget(help_browser)
 
     def create_menu_bar(self):
         menubar = self.menuBar()
@@ -909,20 +1493,33 @@ class LinuxAppInstaller(QMainWindow):
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.show()
 
+    def get_setting(self, key, default=None):
+        """Return a setting from the in-memory cache"""
+        return self._settings_cache.get(key, SETTINGS_DEFAULTS.get(key, default))
+
     def load_settings(self):
         # Load settings from QSettings
         pass
 
-    def save_settings(self):
-        # Save settings to QSettings
+    def write_settings(self):
+        # Save settings to QSettings in one batch
         settings = {
             "auto_start_queue": self.auto_start_queue_checkbox.isChecked(),
             "show_notifications": self.show_notifications_checkbox.isChecked(),
             "verbose_logging": self.verbose_logging_checkbox.isChecked(),
+            "durable_history": self.durable_history_checkbox.isChecked(),
             "install_dir": self.install_dir_edit.text()
         }
         for key, value in settings.items():
-            self.settings.setValue(key, value)
+            if self._settings_cache.get(key) != value:
+                self.settings.setValue(key, value)
+                self._settings_cache[key] = value
+        self.history_writer.durable = settings["durable_history"]
+        # No explicit sync(): QSettings writes back from the event loop and on exit
+
+    def save_settings(self):
+        self._settings_dirty_timer.stop()
+        self.write_settings()
         QMessageBox.information(self, "Settings Saved", "Settings have been saved successfully.")
 
     def browse_install_dir(self):
@@ -935,30 +1532,52 @@ class LinuxAppInstaller(QMainWindow):
             self,
             "Add Files to Queue",
             "",
-            "All Supported Files (*.deb *.appimage *.tar.gz *.tar.xz *.tgz *.snap *.flatpak *.run *.bin);;All Files (*)"
+            _FILE_DIALOG_FILTER
         )
+        self.enqueue_files(files)
+
+    def enqueue_files(self, files):
+        # Tasks enter the queue immediately; hashes stream back from the thread pool
         for file_path in files:
             if os.path.isfile(file_path):
                 task = InstallationTask(file_path)
+                task.file_hash = "pending"
                 self.installation_queue.append(task)
-                self.update_queue_display()
+                self._queue_index[task.task_id] = task
+                QThreadPool.globalInstance().start(HashRunnable(task, self.hash_signals))
+        self.queue_tab.mark_dirty()
+
+    def on_hash_ready(self, task_id, file_hash):
+        task = self._queue_index.get(task_id)
+        if not task:
+            return
+        if task.file_hash == "pending":  # The installer may already have resolved it
+            task.file_hash = file_hash
+        for row in range(self.queue_list.count()):
+            item = self.queue_list.item(row)
+            if item.data(Qt.UserRole) == task_id:
+                item.setToolTip(f"SHA256: {task.file_hash}")
+                break
 
     def remove_from_queue(self):
         current_item = self.queue_list.currentItem()
         if current_item:
             task_id = current_item.data(Qt.UserRole)
             self.installation_queue = [task for task in self.installation_queue if task.task_id != task_id]
-            self.update_queue_display()
+            self._queue_index.pop(task_id, None)
+            self.queue_tab.mark_dirty()
 
     def clear_queue(self):
         self.installation_queue.clear()
-        self.update_queue_display()
+        self._queue_index.clear()
+        self.queue_tab.mark_dirty()
 
     def update_queue_display(self):
         self.queue_list.clear()
         for task in self.installation_queue:
-            item = QListWidgetItem(f"{os.path.basename(task.file_path)} ({task.get_file_type()})")
+            item = QListWidgetItem(f"{task.basename} ({task.get_file_type()})")
             item.setData(Qt.UserRole, task.task_id)
+            item.setToolTip(f"SHA256: {task.file_hash}")
             self.queue_list.addItem(item)
 
     def start_batch_installation(self):
@@ -971,7 +1590,6 @@ class LinuxAppInstaller(QMainWindow):
             return
 
         self.current_batch_installer = BatchInstaller(self.installation_queue.copy())
-        self.current_batch_installer.set_installer(self)  # Pass reference to main window
         self.current_batch_installer.progress_updated.connect(self.on_batch_progress)
         self.current_batch_installer.task_completed.connect(self.on_batch_task_completed)
         self.current_batch_installer.batch_finished.connect(self.on_batch_finished)
@@ -986,18 +1604,20 @@ class LinuxAppInstaller(QMainWindow):
 
     def on_batch_task_completed(self, task_id, success, message):
         # Handle task completion
-        task = next((t for t in self.installation_queue if t.task_id == task_id), None)
+        task = self._queue_index.pop(task_id, None)
         if task:
             task.status = "completed" if success else "failed"
             task.message = message
             self.save_history_entry(task)
-            self.update_queue_display()
-            self.load_history()
+            # Finished tasks leave the queue so the next batch doesn't run them again
+            self.installation_queue = [queued for queued in self.installation_queue if queued is not task]
+            self.queue_tab.mark_dirty()
 
     def on_batch_finished(self):
         self.current_batch_installer = None
         self.batch_install_button.setEnabled(True)
         self.status_bar.showMessage("Batch installation completed.")
+        self.flush_desktop_db()
         QMessageBox.information(self, "Batch Complete", "All files in the queue have been processed.")
 
     def start_installation(self):
@@ -1010,35 +1630,48 @@ class LinuxAppInstaller(QMainWindow):
 
     def load_history(self):
         try:
-            if os.path.exists('history.json'):
-                with open('history.json', 'r') as f:
-                    history_data = json.load(f)
-                    self.installation_history = [InstallationTask.from_dict(item) for item in history_data]
-            else:
-                self.installation_history = []
+            self.installation_history = [InstallationTask.from_dict(item) for item in self.history_writer.load()]
         except Exception as e:
             logging.error(f"Failed to load history: {e}")
             self.installation_history = []
 
-        self.update_history_display()
+        self._recent_history = deque(reversed(self.installation_history[-HISTORY_DISPLAY_LIMIT:]),
+                                     maxlen=HISTORY_DISPLAY_LIMIT)
+        self.history_tab.mark_dirty()
 
     def update_history_display(self):
-        self.history_table.setRowCount(len(self.installation_history))
-        for row, task in enumerate(reversed(self.installation_history[-100:])):  # Show last 100 entries
-            self.history_table.setItem(row, 0, QTableWidgetItem(os.path.basename(task.file_path)))
-            self.history_table.setItem(row, 1, QTableWidgetItem(task.get_file_type()))
-            self.history_table.setItem(row, 2, QTableWidgetItem(task.status.capitalize()))
-            timestamp = task.end_time.strftime("%Y-%m-%d %H:%M:%S") if task.end_time else "N/A"
-            self.history_table.setItem(row, 3, QTableWidgetItem(timestamp))
+        # Full rebuild, only needed after loading or clearing history
+        self.history_table.setUpdatesEnabled(False)
+        self.history_table.blockSignals(True)
+        self.history_table.setRowCount(len(self._recent_history))
+        for row, task in enumerate(self._recent_history):
+            self.set_history_row(row, task)
+        self.history_table.blockSignals(False)
+        self.history_table.setUpdatesEnabled(True)
+
+    def set_history_row(self, row, task):
+        self.history_table.setItem(row, 0, QTableWidgetItem(task.basename))
+        self.history_table.setItem(row, 1, QTableWidgetItem(task.get_file_type()))
+        self.history_table.setItem(row, 2, QTableWidgetItem(task.status.capitalize()))
+        timestamp = task.end_time.strftime("%Y-%m-%d %H:%M:%S") if task.end_time else "N/A"
+        self.history_table.setItem(row, 3, QTableWidgetItem(timestamp))
+
+    def prepend_history_row(self, task):
+        self.history_table.setUpdatesEnabled(False)
+        self.history_table.blockSignals(True)
+        self.history_table.insertRow(0)
+        self.set_history_row(0, task)
+        if self.history_table.rowCount() > HISTORY_DISPLAY_LIMIT:
+            self.history_table.removeRow(HISTORY_DISPLAY_LIMIT)
+        self.history_table.blockSignals(False)
+        self.history_table.setUpdatesEnabled(True)
 
     def save_history_entry(self, task):
         self.installation_history.append(task)
-        try:
-            history_data = [task.to_dict() for task in self.installation_history[-1000:]]  # Keep last 1000 entries
-            with open('history.json', 'w') as f:
-                json.dump(history_data, f, indent=2, default=str)
-        except Exception as e:
-            logging.error(f"Failed to save history: {e}")
+        self._recent_history.appendleft(task)
+        if not self.history_tab.dirty:  # A pending full rebuild will pick it up otherwise
+            self.prepend_history_row(task)
+        self.history_writer.submit(task)
 
     def clear_history(self):
         reply = QMessageBox.question(self, "Clear History", 
@@ -1046,42 +1679,38 @@ class LinuxAppInstaller(QMainWindow):
                                    QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
             self.installation_history.clear()
-            try:
-                if os.path.exists('history.json'):
-                    os.remove('history.json')
-            except Exception as e:
-                logging.error(f"Failed to delete history file: {e}")
-            self.update_history_display()
+            self._recent_history.clear()
+            self.history_writer.clear()
+            self.history_tab.mark_dirty()
+
+    def closeEvent(self, event):
+        if self._settings_dirty_timer.isActive():  # Don't lose an edit still waiting on the debounce
+            self._settings_dirty_timer.stop()
+            self.write_settings()
+        self.history_writer.stop()  # Flushes anything still pending
+        self.flush_desktop_db()  # Don't lose a refresh still waiting on the timer
+        self.stop_shell()
+        if self._setup_executor is not None:
+            self._setup_executor.shutdown(wait=True)
+        super().closeEvent(event)
 
     def show_about(self):
         QMessageBox.about(self, "About Linux Universal App Installer",
-                         "Version 2.0\n\nA professional drag-and-drop application installer for Linux.\n\nSupports: .deb, .appimage, .tar.gz, .tar.xz, .tgz, .snap, .flatpak, .run, .bin")
+                         "Version 2.0\n\nA professional drag-and-drop application installer for Linux.\n\nSupports: " + _SUPPORTED_LABEL)
 
     def check_dependencies(self):
         required_cmds = ['pkexec', 'tar']
         for cmd in required_cmds:
-            if not shutil.which(cmd):
+            if not _which(cmd):
                 error_msg = f"Required command '{cmd}' not found. Please install it."
                 logging.error(error_msg)
                 QMessageBox.critical(None, "Missing Dependency", error_msg)
                 sys.exit(1)
 
-    def create_menu(self):
-        menu_bar = self.menuBar()
-        logs_menu = menu_bar.addMenu("Logs")
-        view_logs_action = logs_menu.addAction("View Error Logs")
-        view_logs_action.triggered.connect(self.view_logs)
-
     def dragEnterEvent(self, event: QDragEnterEvent):
-        if event.mimeData().hasUrls():
-            self.drop_widget.setStyleSheet("""
-                QWidget {
-                    background-color: #d5f4e6;
-                    border: 2px dashed #27ae60;
-                    border-radius: 15px;
-                    padding: 20px;
-                }
-            """)
+        mime_data = event.mimeData()
+        if mime_data.hasUrls() and any(_file_ext(url.toLocalFile()) in _SUPPORTED_EXTS for url in mime_data.urls()):
+            self.set_drop_active(True)
             event.accept()
         else:
             event.ignore()
@@ -1094,20 +1723,16 @@ class LinuxAppInstaller(QMainWindow):
         if self.installing:
             self.status_label.setText("Installation already in progress. Please wait.")
             return
-        files = [u.toLocalFile() for u in event.mimeData().urls()]
-        for file_path in files:
-            if os.path.isfile(file_path):
-                self.install_file(file_path)
+        self.install_files([u.toLocalFile() for u in event.mimeData().urls()])
 
     def reset_drop_style(self):
-        self.drop_widget.setStyleSheet("""
-            QWidget {
-                background-color: #ecf0f1;
-                border: 2px dashed #bdc3c7;
-                border-radius: 15px;
-                padding: 20px;
-            }
-        """)
+        self.set_drop_active(False)
+
+    def set_drop_active(self, active):
+        # Flip the property the stylesheet keys on and re-polish just this widget
+        self.drop_widget.setProperty("dragActive", active)
+        self.drop_widget.style().unpolish(self.drop_widget)
+        self.drop_widget.style().polish(self.drop_widget)
 
     def browse_files(self):
         if self.installing:
@@ -1117,11 +1742,34 @@ class LinuxAppInstaller(QMainWindow):
             self,
             "Select Files to Install",
             "",
-            "All Supported Files (*.deb *.appimage *.tar.gz *.tar.xz *.tgz *.snap *.flatpak *.run *.bin);;All Files (*)"
+            _FILE_DIALOG_FILTER
         )
-        for file_path in files:
-            if os.path.isfile(file_path):
-                self.install_file(file_path)
+        self.install_files(files)
+
+    def install_files(self, files):
+        files = [file_path for file_path in files if os.path.isfile(file_path)]
+        # A drop is accepted if any file is supported; leave the rest out of the queue
+        skipped = [os.path.basename(file_path) for file_path in files
+                   if _file_ext(file_path) not in _SUPPORTED_EXTS]
+        skipped_msg = f" Skipped unsupported files: {', '.join(skipped)}." if skipped else ""
+        if skipped:
+            files = [file_path for file_path in files if _file_ext(file_path) in _SUPPORTED_EXTS]
+            logging.warning(skipped_msg.strip())
+        if len(files) == 1:
+            if skipped:
+                self.status_bar.showMessage(skipped_msg.strip())
+            self.install_file(files[0])
+        elif files:
+            # Only one direct install can run at a time, so batches go through the queue
+            self.enqueue_files(files)
+            if self.get_setting("auto_start_queue"):
+                self.status_bar.showMessage(f"Installing {len(files)} files from the installation queue." + skipped_msg)
+                self.start_batch_installation()
+            else:
+                self.status_bar.showMessage(f"Added {len(files)} files to the installation queue. "
+                                            "Press \"Install All in Queue\" to install them." + skipped_msg)
+        elif skipped:
+            self.status_bar.showMessage(skipped_msg.strip())
 
     def install_file(self, file_path):
         if self.installing:
@@ -1133,7 +1781,11 @@ class LinuxAppInstaller(QMainWindow):
             return
 
         try:
-            if not os.path.exists(file_path):
+            try:
+                st = os.stat(file_path)  # One stat covers both existence and size
+            except OSError:
+                st = None
+            if st is None:
                 error_msg = f"File does not exist: {file_path}"
                 logging.error(error_msg)
                 raise Exception(error_msg)
@@ -1141,7 +1793,7 @@ class LinuxAppInstaller(QMainWindow):
                 error_msg = f"File is not readable: {file_path}"
                 logging.error(error_msg)
                 raise Exception(error_msg)
-            if os.path.getsize(file_path) == 0:
+            if st.st_size == 0:
                 error_msg = f"File is empty: {file_path}"
                 logging.error(error_msg)
                 raise Exception(error_msg)
@@ -1150,7 +1802,7 @@ class LinuxAppInstaller(QMainWindow):
             return
 
         ext = self.get_file_type(file_path)
-        if ext not in ['deb', 'appimage', 'tar.gz', 'tar.xz', 'tgz', 'snap', 'flatpak', 'run', 'bin']:
+        if ext not in _SUPPORTED_EXTS:
             error_msg = f"Unsupported file type: {ext}"
             logging.error(error_msg)
             self.show_error(error_msg)
@@ -1163,39 +1815,27 @@ class LinuxAppInstaller(QMainWindow):
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)  # Indeterminate progress
 
-        install_func = getattr(self, f"install_{ext.replace('.', '_')}")
-        self.current_worker = InstallWorker(install_func, file_path)
+        self.current_worker = InstallWorker(self._installers[ext], file_path)
         self.current_worker.finished.connect(self.on_install_finished)
         self.current_worker.error.connect(self.on_install_error)
         self.current_worker.start()
 
     def get_file_type(self, file_path):
-        if file_path.endswith('.tar.gz'):
-            return 'tar.gz'
-        elif file_path.endswith('.tar.xz'):
-            return 'tar.xz'
-        _, ext = os.path.splitext(file_path)
-        return ext.lower().lstrip('.')
+        return _file_ext(file_path)
 
     def install_deb(self, file_path):
-        if not shutil.which('dpkg'):
+        if not _which('dpkg'):
             raise Exception("dpkg not found. Please install dpkg.")
         self.run_command(['pkexec', 'dpkg', '-i', file_path])
         self.run_command(['pkexec', 'apt-get', 'install', '-f'])
+        _which.cache_clear()  # Dependencies may have added or moved tools
         return f"Successfully installed {os.path.basename(file_path)}"
 
     def install_appimage(self, file_path):
         app_dir = os.path.expanduser("~/Applications")
         try:
             os.makedirs(app_dir, exist_ok=True)
-            dest = os.path.join(app_dir, os.path.basename(file_path))
-            if os.path.exists(dest):
-                base, ext = os.path.splitext(dest)
-                counter = 1
-                while os.path.exists(f"{base}_{counter}{ext}"):
-                    counter += 1
-                dest = f"{base}_{counter}{ext}"
-            shutil.move(file_path, dest)
+            dest = _move_to_free_path(file_path, app_dir)
             os.chmod(dest, 0o755)
 
             # Create desktop integration
@@ -1208,22 +1848,15 @@ class LinuxAppInstaller(QMainWindow):
             raise Exception(f"Failed to install AppImage: {e}")
         return f"AppImage installed to {dest} with desktop integration"
 
-    def install_tar_gz(self, file_path):
-        return self.install_tar(file_path)
-
-    def install_tar_xz(self, file_path):
-        return self.install_tar(file_path)
-
-    def install_tgz(self, file_path):
-        return self.install_tar(file_path)
-
     def install_tar(self, file_path):
         app_dir = os.path.expanduser("~/Applications")
         try:
             os.makedirs(app_dir, exist_ok=True)
             extract_dir = os.path.join(app_dir, os.path.splitext(os.path.basename(file_path))[0])
             os.makedirs(extract_dir, exist_ok=True)
-            self.run_command(['tar', '-xf', file_path, '-C', extract_dir])
+            if not _extract_archive(file_path, extract_dir):
+                _prefetch_file(file_path)
+                self.run_command(_tar_command(file_path, extract_dir))
 
             # Look for executable files and create desktop entries
             self.create_tar_desktop_entries(extract_dir)
@@ -1242,23 +1875,17 @@ class LinuxAppInstaller(QMainWindow):
         return f"Extracted to {extract_dir} with desktop integration"
 
     def install_snap(self, file_path):
-        if not shutil.which('snap'):
+        if not _which('snap'):
             raise Exception("snap not found. Please install snapd.")
         self.run_command(['pkexec', 'snap', 'install', file_path, '--dangerous'])
         return f"Successfully installed {os.path.basename(file_path)}"
 
     def install_flatpak(self, file_path):
-        if not shutil.which('flatpak'):
+        if not _which('flatpak'):
             raise Exception("flatpak not found. Please install flatpak.")
         self.run_command(['flatpak', 'install', '--user', file_path])
         return f"Successfully installed {os.path.basename(file_path)}"
 
-    def install_run(self, file_path):
-        return self.install_executable(file_path)
-
-    def install_bin(self, file_path):
-        return self.install_executable(file_path)
-
     def install_executable(self, file_path):
         try:
             os.chmod(file_path, 0o755)
@@ -1283,7 +1910,6 @@ class LinuxAppInstaller(QMainWindow):
         """Create desktop shortcut and menu entry for AppImage"""
         try:
             app_name = os.path.splitext(os.path.basename(appimage_path))[0]
-            desktop_file = os.path.expanduser(f"~/.local/share/applications/{app_name}.desktop")
 
             # Try to extract icon from AppImage if possible
             icon_path = self.extract_appimage_icon(appimage_path, app_name)
@@ -1300,55 +1926,39 @@ StartupWMClass={app_name}
 Categories=Utility;Application;
 """
 
-            # Write desktop file for menu
-            os.makedirs(os.path.dirname(desktop_file), exist_ok=True)
-            with open(desktop_file, 'w') as f:
-                f.write(desktop_content)
-
-            # Create desktop shortcut
-            desktop_shortcut = os.path.expanduser(f"~/Desktop/{app_name}.desktop")
-            with open(desktop_shortcut, 'w') as f:
-                f.write(desktop_content)
+            # Menu entry plus Desktop shortcut
+            _write_desktop_entry(app_name, desktop_content)
 
-            os.chmod(desktop_file, 0o755)
-            os.chmod(desktop_shortcut, 0o755)
-
-            # Update desktop database
-            self.run_command(['update-desktop-database', os.path.expanduser('~/.local/share/applications')])
+            self._pending_desktop_refresh = True  # Flushed once the install settles
 
         except Exception as e:
             logging.warning(f"Failed to create desktop entry for {appimage_path}: {e}")
 
     def extract_appimage_icon(self, appimage_path, app_name):
         """Try to extract icon from AppImage"""
+        # Extract only .DirIcon from the embedded squashfs; unlike --appimage-mount
+        # this needs no FUSE helper and returns as soon as the file is written
         try:
-            # Mount the AppImage temporarily to extract icon
-            mount_point = f"/tmp/{app_name}_mount"
-            os.makedirs(mount_point, exist_ok=True)
-
-            # Try to mount AppImage (this might not work on all systems)
-            result = subprocess.run([appimage_path, '--appimage-mount'], capture_output=True, text=True, timeout=10)
-            if result.returncode == 0 and result.stdout.strip():
-                actual_mount = result.stdout.strip()
-                icon_dir = os.path.join(actual_mount, '.DirIcon')
-                if os.path.exists(icon_dir):
-                    # Copy icon to local icons directory
-                    icons_dir = os.path.expanduser('~/.local/share/icons')
-                    os.makedirs(icons_dir, exist_ok=True)
-                    icon_dest = os.path.join(icons_dir, f"{app_name}.png")
-                    shutil.copy2(icon_dir, icon_dest)
-                    return icon_dest
-
-            # Fallback: look for common icon names in the mount point
-            if 'actual_mount' in locals():
-                for icon_name in ['.DirIcon', 'icon.png', 'Icon.png', f"{app_name}.png"]:
-                    icon_path = os.path.join(actual_mount, icon_name)
-                    if os.path.exists(icon_path):
-                        icons_dir = os.path.expanduser('~/.local/share/icons')
-                        os.makedirs(icons_dir, exist_ok=True)
-                        icon_dest = os.path.join(icons_dir, f"{app_name}.png")
-                        shutil.copy2(icon_path, icon_dest)
-                        return icon_dest
+            with tempfile.TemporaryDirectory() as work_dir:
+                root = os.path.join(work_dir, 'squashfs-root')
+                icon_path = os.path.join(root, '.DirIcon')
+                for _ in range(3):  # .DirIcon is usually a symlink to the real icon
+                    subprocess.run([appimage_path, '--appimage-extract', os.path.relpath(icon_path, root)],
+                                   cwd=work_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10)
+                    if not os.path.islink(icon_path):
+                        break
+                    icon_path = os.path.normpath(os.path.join(os.path.dirname(icon_path), os.readlink(icon_path)))
+                    if not icon_path.startswith(root + os.sep):
+                        return None
+
+                if not os.path.isfile(icon_path) or os.path.islink(icon_path):
+                    return None
+                ext = os.path.splitext(icon_path)[1].lower()
+                icons_dir = os.path.expanduser('~/.local/share/icons')
+                os.makedirs(icons_dir, exist_ok=True)
+                icon_dest = os.path.join(icons_dir, f"{app_name}{ext if ext in ('.png', '.svg', '.xpm') else '.png'}")
+                _move_file(icon_path, icon_dest)
+                return icon_dest
 
         except Exception as e:
             logging.debug(f"Could not extract icon from AppImage {appimage_path}: {e}")
@@ -1358,29 +1968,13 @@ Categories=Utility;Application;
     def create_tar_desktop_entries(self, extract_dir):
         """Create desktop entries for executables found in extracted tar archive"""
         try:
-            # Find executable files
-            executables = []
-            for root, dirs, files in os.walk(extract_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if os.access(file_path, os.X_OK) and not file.endswith(('.so', '.dll', '.dylib')):
-                        # Check if it's a binary executable (not script)
-                        try:
-                            with open(file_path, 'rb') as f:
-                                header = f.read(4)
-                                if header.startswith(b'\x7fELF') or header.startswith(b'#!/'):  # ELF binary or script
-                                    executables.append(file_path)
-                        except:
-                            continue
+            # Limit to 3 executables to avoid spam; installer scripts are skipped
+            executables = _find_executables(extract_dir, limit=3)
 
             # Create desktop entries for found executables
-            for exe_path in executables[:3]:  # Limit to 3 executables to avoid spam
+            for exe_path in executables:
                 exe_name = os.path.basename(exe_path)
-                if exe_name in ['install.sh', 'uninstall.sh', 'configure']:
-                    continue  # Skip common installer scripts
-
                 app_name = exe_name
-                desktop_file = os.path.expanduser(f"~/.local/share/applications/{app_name}.desktop")
 
                 desktop_content = f"""[Desktop Entry]
 Version=1.0
@@ -1393,22 +1987,11 @@ Terminal=false
 Categories=Utility;Application;
 """
 
-                # Write desktop file for menu
-                os.makedirs(os.path.dirname(desktop_file), exist_ok=True)
-                with open(desktop_file, 'w') as f:
-                    f.write(desktop_content)
-
-                # Create desktop shortcut
-                desktop_shortcut = os.path.expanduser(f"~/Desktop/{app_name}.desktop")
-                with open(desktop_shortcut, 'w') as f:
-                    f.write(desktop_content)
-
-                os.chmod(desktop_file, 0o755)
-                os.chmod(desktop_shortcut, 0o755)
+                # Menu entry plus Desktop shortcut
+                _write_desktop_entry(app_name, desktop_content)
 
-            # Update desktop database
             if executables:
-                self.run_command(['update-desktop-database', os.path.expanduser('~/.local/share/applications')])
+                self._pending_desktop_refresh = True  # Flushed once the install settles
 
         except Exception as e:
             logging.warning(f"Failed to create desktop entries for {extract_dir}: {e}")
@@ -1418,7 +2001,6 @@ Categories=Utility;Application;
         try:
             exe_name = os.path.basename(exe_path)
             app_name = os.path.splitext(exe_name)[0]
-            desktop_file = os.path.expanduser(f"~/.local/share/applications/{app_name}.desktop")
 
             desktop_content = f"""[Desktop Entry]
 Version=1.0
@@ -1431,21 +2013,10 @@ Terminal=false
 Categories=Utility;Application;
 """
 
-            # Write desktop file for menu
-            os.makedirs(os.path.dirname(desktop_file), exist_ok=True)
-            with open(desktop_file, 'w') as f:
-                f.write(desktop_content)
-
-            # Create desktop shortcut
-            desktop_shortcut = os.path.expanduser(f"~/Desktop/{app_name}.desktop")
-            with open(desktop_shortcut, 'w') as f:
-                f.write(desktop_content)
+            # Menu entry plus Desktop shortcut
+            _write_desktop_entry(app_name, desktop_content)
 
-            os.chmod(desktop_file, 0o755)
-            os.chmod(desktop_shortcut, 0o755)
-
-            # Update desktop database
-            self.run_command(['update-desktop-database', os.path.expanduser('~/.local/share/applications')])
+            self._pending_desktop_refresh = True  # Flushed once the install settles
 
         except Exception as e:
             logging.warning(f"Failed to create desktop entry for {exe_path}: {e}")
@@ -1475,10 +2046,10 @@ Categories=Utility;Application;
             return {}
 
     def create_uninstall_entry(self, app_name, install_path, uninstall_command=None):
-        """Create uninstall entry for the application"""
+        """Create uninstall entry for the application. Returns False if it failed."""
         try:
             # Create desktop uninstaller
-            uninstall_desktop = os.path.expanduser(f"~/.local/share/applications/{app_name}-uninstall.desktop")
+            uninstall_desktop = os.path.join(APPLICATIONS_DIR, f"{app_name}-uninstall.desktop")
 
             if uninstall_command:
                 exec_cmd = uninstall_command
@@ -1486,97 +2057,102 @@ Categories=Utility;Application;
                 # Default uninstall command (could be enhanced)
                 exec_cmd = f"rm -rf {install_path}"
 
-            desktop_content = f"""[Desktop Entry]
-Version=1.0
-Type=Application
-Name=Uninstall {app_name}
-Comment=Uninstall {app_name}
-Exec={exec_cmd}
-Icon=edit-delete
-Terminal=true
-Categories=Utility;System;
-"""
+            desktop_content = _UNINSTALL_TMPL.format_map({'app_name': app_name, 'exec_cmd': exec_cmd})
 
             with open(uninstall_desktop, 'w') as f:
                 f.write(desktop_content)
             os.chmod(uninstall_desktop, 0o755)
+            return True
 
         except Exception as e:
             logging.warning(f"Failed to create uninstall entry for {app_name}: {e}")
+            return False
 
     def setup_file_associations(self, app_name, file_extensions=None):
-        """Set up file associations for the application"""
+        """Set up file associations for the application. Returns False if it failed."""
         if not file_extensions:
-            return
+            return True
 
         try:
+            # Read existing defaults
+            defaults = {}
+            if os.path.exists(DEFAULTS_LIST_FILE):
+                with open(DEFAULTS_LIST_FILE, 'r') as f:
+                    defaults = dict(line.split('=', 1) for line in f.read().splitlines() if '=' in line)
+
+            desktop_name = f"{app_name}.desktop"
+            packages = []
             for ext in file_extensions:
-                mime_type = f"application/x-{app_name}-{ext.lstrip('.')}"
+                clean_ext = ext.lstrip('.')
+                packages.append((ext, f"application/x-{app_name}-{clean_ext}",
+                                 f"{MIME_PACKAGES_DIR}/{app_name}-{clean_ext}.xml"))
 
-                # Create mime type file
-                mime_dir = os.path.expanduser("~/.local/share/mime/packages")
-                os.makedirs(mime_dir, exist_ok=True)
+            # Already associated from an earlier install: nothing to write or rebuild
+            if all(defaults.get(mime_type) == desktop_name and os.path.exists(mime_file)
+                   for _, mime_type, mime_file in packages):
+                return True
 
-                mime_file = os.path.join(mime_dir, f"{app_name}-{ext.lstrip('.')}.xml")
-                mime_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<mime-info xmlns="http://www.freedesktop.org/standards/shared-mime-info">
-  <mime-type type="{mime_type}">
-    <comment>{app_name} {ext} file</comment>
-    <glob pattern="*{ext}"/>
-  </mime-type>
-</mime-info>"""
+            os.makedirs(MIME_PACKAGES_DIR, exist_ok=True)
+            os.makedirs(APPLICATIONS_DIR, exist_ok=True)
 
-                with open(mime_file, 'w') as f:
-                    f.write(mime_content)
-
-                # Update mime database
-                self.run_command(['update-mime-database', os.path.expanduser('~/.local/share/mime')])
-
-                # Create application association
-                apps_dir = os.path.expanduser("~/.local/share/applications")
-                defaults_file = os.path.join(apps_dir, f"defaults.list")
-                os.makedirs(apps_dir, exist_ok=True)
-
-                # Read existing defaults
-                defaults = {}
-                if os.path.exists(defaults_file):
-                    with open(defaults_file, 'r') as f:
-                        for line in f:
-                            if '=' in line:
-                                key, value = line.strip().split('=', 1)
-                                defaults[key] = value
+            # Reinstalls usually regenerate identical files; only write what differs
+            mime_changed = defaults_changed = False
+            for ext, mime_type, mime_file in packages:
+                # Create mime type file
+                body = _MIME_TYPE_TMPL.format(mime_type=mime_type, app_name=app_name, ext=ext).encode()
+                if _write_parts_if_changed(mime_file, [_MIME_PACKAGE_PROLOGUE, body, _MIME_PACKAGE_EPILOGUE]):
+                    mime_changed = True
 
                 # Add our association
-                defaults[mime_type] = f"{app_name}.desktop"
+                if defaults.get(mime_type) != desktop_name:
+                    defaults[mime_type] = desktop_name
+                    defaults_changed = True
+
+            if defaults_changed:
+                # Write back once; a crash mid-write must not wipe every association
+                _write_atomic(DEFAULTS_LIST_FILE, "[Default Applications]\n" +
+                              ''.join(f"{key}={value}\n" for key, value in defaults.items()))
 
-                # Write back
-                with open(defaults_file, 'w') as f:
-                    for key, value in defaults.items():
-                        f.write(f"{key}={value}\n")
+            if mime_changed:
+                # Update mime database once for every package file written above
+                self.run_shell_command(['update-mime-database', MIME_DIR])
+            return True
 
         except Exception as e:
             logging.warning(f"Failed to setup file associations for {app_name}: {e}")
+            return False
 
     def post_install_setup(self, app_name, install_path, file_type):
         """Perform post-installation setup like Windows installers do"""
+        # A marker newer than the install path means this exact setup already ran
+        key = hashlib.blake2b(f"{app_name}|{install_path}|{file_type}".encode(), digest_size=16).hexdigest()
+        marker = os.path.join(POST_INSTALL_MARKER_DIR, f"{key}.done")
         try:
-            # Create application directories
-            dirs = self.setup_application_directories(app_name)
-
-            # Create uninstall entry
-            self.create_uninstall_entry(app_name, install_path)
-
-            # Setup file associations based on file type
-            file_associations = {
-                'appimage': ['.appimage'],
-                'tar.gz': ['.tar.gz', '.tgz'],
-                'tar.xz': ['.tar.xz'],
-                'run': ['.run'],
-                'bin': ['.bin']
-            }
+            if os.stat(marker).st_mtime_ns >= os.stat(install_path).st_mtime_ns:
+                with open(marker, 'r') as f:
+                    completion_msg = f.read()
+                logging.info(f"Post-installation setup already done for {app_name}")
+                return completion_msg
+        except OSError:
+            pass
 
-            if file_type in file_associations:
-                self.setup_file_associations(app_name, file_associations[file_type])
+        try:
+            if self._setup_executor is None:
+                self._setup_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix='post-install')
+            executor = self._setup_executor
+
+            # Application directories, uninstall entry and file associations don't
+            # depend on each other; update-mime-database overlaps the other writes
+            dirs_future = executor.submit(self.setup_application_directories, app_name)
+            futures = [dirs_future, executor.submit(self.create_uninstall_entry, app_name, install_path)]
+            exts = _FILE_ASSOCIATIONS.get(file_type)
+            if exts:
+                futures.append(executor.submit(self.setup_file_associations, app_name, exts))
+            concurrent.futures.wait(futures)  # Each step logs its own failures
+            dirs = dirs_future.result()
+            # Directories come back empty and the other steps return False on failure
+            succeeded = all(future.result() for future in futures)
 
             # Show completion message with details
             completion_msg = f"""
@@ -1593,23 +2169,102 @@ The application is now ready to use. You can find it in your applications menu o
 """
 
             logging.info(f"Post-installation setup completed for {app_name}")
+            if succeeded:  # Only cache a complete setup; a failed step is retried next time
+                try:
+                    os.makedirs(POST_INSTALL_MARKER_DIR, exist_ok=True)
+                    with open(marker, 'w') as f:
+                        f.write(completion_msg)
+                except OSError as e:
+                    logging.warning(f"Failed to record post-installation setup for {app_name}: {e}")
             return completion_msg
 
         except Exception as e:
             logging.warning(f"Post-installation setup failed for {app_name}: {e}")
             return f"Application '{app_name}' installed successfully, but some integration features may not be available."
 
+    def flush_desktop_db(self):
+        """Run update-desktop-database once if any desktop entries were written"""
+        self._desktop_db_timer.stop()
+        if not self._pending_desktop_refresh:
+            return
+        self._pending_desktop_refresh = False
+        if not QProcess.startDetached('update-desktop-database', [APPLICATIONS_DIR]):
+            logging.warning("Failed to start update-desktop-database")
+
+    def run_shell_command(self, cmd):
+        """Run a short housekeeping command through the persistent shell, saving a fork+exec"""
+        sentinel = f"__DONE_{uuid.uuid4().hex}__"
+        timed_out = threading.Event()
+        with self._sh_lock:
+            if self._sh is None or self._sh.poll() is not None:
+                self._sh = subprocess.Popen(['/bin/sh'], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                            stderr=subprocess.STDOUT, text=True, errors='replace')
+            sh = self._sh
+            sh.stdin.write(f"{shlex.join(cmd)} </dev/null 2>&1; echo {sentinel}$?\n")
+            sh.stdin.flush()
+
+            def kill():
+                timed_out.set()
+                sh.kill()
+
+            timer = threading.Timer(300, kill)  # 5 min timeout
+            timer.start()
+            output = []
+            returncode = None
+            try:
+                for line in sh.stdout:
+                    index = line.find(sentinel)
+                    if index >= 0:
+                        output.append(line[:index])
+                        returncode = int(line[index + len(sentinel):])
+                        break
+                    output.append(line)
+            finally:
+                timer.cancel()
+            if returncode is None:
+                self._sh = None  # Respawned by the next call
+
+        if timed_out.is_set():
+            error_msg = f"Command timed out: {' '.join(cmd)}"
+        elif returncode is None:
+            error_msg = f"Shell exited while running: {' '.join(cmd)}"
+        elif returncode != 0:
+            error_msg = ''.join(output).strip()
+        else:
+            return
+        logging.error(f"Command failed: {' '.join(cmd)} - {error_msg}")
+        raise Exception(error_msg)
+
+    def stop_shell(self):
+        with self._sh_lock:
+            if self._sh is not None:
+                self._sh.stdin.close()  # The shell exits at end of input
+                self._sh.wait()
+                self._sh = None
+
     def run_command(self, cmd):
+        """Run a command with stdout discarded; stderr is only used for the error message"""
+        process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                   text=True, errors='replace')
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)  # 5 min timeout
-            if result.returncode != 0:
-                error_msg = result.stderr.strip() or result.stdout.strip()
-                logging.error(f"Command failed: {' '.join(cmd)} - {error_msg}")
-                raise Exception(error_msg)
+            _, stderr = process.communicate(timeout=300)  # 5 min timeout
         except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
             error_msg = f"Command timed out: {' '.join(cmd)}"
             logging.error(error_msg)
             raise Exception(error_msg)
+        if process.returncode != 0:
+            error_msg = stderr.strip() or f"{cmd[0]} exited with status {process.returncode}"
+            logging.error(f"Command failed: {' '.join(cmd)} - {error_msg}")
+            raise Exception(error_msg)
+
+    def show_notice(self, icon, title, text):
+        """Show a non-modal message box; unlike QMessageBox.information() it doesn't block the caller"""
+        box = QMessageBox(icon, title, text, QMessageBox.Ok, self)
+        box.setAttribute(Qt.WA_DeleteOnClose)
+        box.setModal(False)
+        box.show()
 
     def on_install_finished(self, message):
         try:
@@ -1619,7 +2274,8 @@ The application is now ready to use. You can find it in your applications menu o
             self.browse_button.setEnabled(True)
             self.progress_bar.setVisible(False)
             self.status_label.setText("")
-            QMessageBox.information(self, "Success", message)
+            self._desktop_db_timer.start()
+            self.show_notice(QMessageBox.Information, "Success", message)
         except Exception as e:
             logging.error(f"Error in on_install_finished: {e}")
 
@@ -1631,15 +2287,23 @@ The application is now ready to use. You can find it in your applications menu o
             self.browse_button.setEnabled(True)
             self.progress_bar.setVisible(False)
             self.status_label.setText("")
+            self._desktop_db_timer.start()
             logging.error(f"Installation failed: {error_msg}")
-            QMessageBox.critical(self, "Installation Failed", error_msg)
+            self.show_notice(QMessageBox.Critical, "Installation Failed", error_msg)
         except Exception as e:
             logging.error(f"Error in on_install_error: {e}")
 
     def view_logs(self):
+        from PyQt5.QtWidgets import QDialog, QTextEdit  # Only needed if the logs are opened
+
         try:
-            with open('installer.log', 'r') as f:
-                log_content = f.read()
+            with open('installer.log', 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - LOG_VIEW_TAIL_BYTES))
+                tail = f.read()
+            if size > LOG_VIEW_TAIL_BYTES:
+                tail = tail.partition(b'\n')[2]  # Drop the partial first line
+            log_content = tail.decode('utf-8', 'replace')
         except FileNotFoundError:
             log_content = "No error logs available yet."
         
@@ -1664,6 +2328,7 @@ def main():
     """Main entry point for the Linux Universal App Installer"""
     app = QApplication(sys.argv)
     app.setStyle('Fusion')  # Modern style
+    app.setStyleSheet(STYLESHEET)
     try:
         window = LinuxAppInstaller()
         window.show()
@@ -36,6 +36,9 @@ setup(
             'pytest>=6.0.0',
             'pytest-qt>=3.3.0',
         ],
+        'archive': [
+            'libarchive-c>=5.0',
+        ],
     },
     entry_points={
         'console_scripts': [